@@ -0,0 +1,112 @@
+"""
+In-process caching primitives.
+
+`TTLCache` is a bounded mapping whose entries expire after a fixed time to
+live and are evicted in least-recently-used order once `maxsize` is reached.
+It is safe to use from the event loop and from threadpool workers.
+"""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = monotonic):
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Bumped on every clear(), so loaders can tell whether an invalidation
+        # happened while they were computing a value
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> V | None:
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, generation: int | None = None) -> None:
+
+        """
+        Stores `value` under `key`.
+
+        When `generation` is given and the cache was cleared since it was read,
+        the value is considered stale and silently dropped.
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict[str, Any]:
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.generation,
+            }
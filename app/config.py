@@ -0,0 +1,154 @@
+"""
+Runtime configuration for Clubbi E-commerce API.
+
+All settings are read from environment variables (optionally loaded from a
+`.env` file) once, at import time.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int | None = None) -> int | None:
+
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+
+    return int(value)
+
+
+def env_float(name: str, default: float | None = None) -> float | None:
+
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+
+    return float(value)
+
+
+def env_optional_bool(name: str) -> bool | None:
+
+    if os.getenv(name) is None:
+        return None
+
+    return env_bool(name)
+
+
+# DATABASE
+
+DATA_BASE_URL = os.getenv("DATA_BASE_URL")
+
+# When enabled, request handlers use an AsyncEngine/AsyncSession instead of
+# the blocking Session, so the event loop is never parked on the database.
+DATA_BASE_ASYNC = env_bool("DATA_BASE_ASYNC")
+
+# Optional explicit async URL (e.g. sqlite+aiosqlite:///./dev.db).
+# When unset it is derived from DATA_BASE_URL.
+DATA_BASE_ASYNC_URL = os.getenv("DATA_BASE_ASYNC_URL")
+
+# Optional read replicas, comma-separated sync URLs. Catalog reads and exports
+# are routed to them (see app.db.replicas); writes always use DATA_BASE_URL.
+# A replica that fails to connect is skipped for DB_REPLICA_RETRY_SECONDS.
+DATA_BASE_READ_URLS = [url.strip() for url in os.getenv("DATA_BASE_READ_URL", "").split(",") if url.strip()]
+DB_REPLICA_RETRY_SECONDS = env_float("DB_REPLICA_RETRY_SECONDS", 30.0)
+
+# Test mode: fail any request that lazy-loads a relationship (N+1 guard)
+DB_LAZY_LOAD_GUARD = env_bool("DB_LAZY_LOAD_GUARD")
+
+# ENGINE PROFILE (dev | prod | bench)
+# Each profile ships pool defaults (see app.db.engine_profiles); the
+# variables below override individual settings when present.
+
+DB_PROFILE = os.getenv("DB_PROFILE", "dev")
+DB_POOL_SIZE = env_int("DB_POOL_SIZE")
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW")
+DB_POOL_TIMEOUT = env_float("DB_POOL_TIMEOUT")
+DB_POOL_PRE_PING = env_optional_bool("DB_POOL_PRE_PING")
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE")
+DB_STATEMENT_TIMEOUT_MS = env_int("DB_STATEMENT_TIMEOUT_MS")
+# Fraction of statements written to the SQL log (0 disables it, 1 logs all)
+DB_SQL_LOG_SAMPLE_RATE = env_float("DB_SQL_LOG_SAMPLE_RATE")
+
+# CATALOG CACHE
+# Pre-serialized catalog listings are kept in memory for up to TTL seconds.
+# Setting either value to 0 disables the cache.
+
+CATALOG_CACHE_TTL_SECONDS = env_float("CATALOG_CACHE_TTL_SECONDS", 300.0)
+CATALOG_CACHE_MAX_ENTRIES = env_int("CATALOG_CACHE_MAX_ENTRIES", 256)
+
+# IDEMPOTENCY
+# Responses stored for an Idempotency-Key are replayed for this long; the
+# most recent ones are also kept in memory, backed by the idempotency_keys table.
+
+IDEMPOTENCY_TTL_SECONDS = env_float("IDEMPOTENCY_TTL_SECONDS", 86400.0)
+IDEMPOTENCY_CACHE_MAX_ENTRIES = env_int("IDEMPOTENCY_CACHE_MAX_ENTRIES", 10000)
+
+# RESPONSE ENCODING
+# Bodies at least this large are compressed (Brotli when accepted and
+# installed, gzip otherwise).
+
+RESPONSE_COMPRESSION_MIN_SIZE = env_int("RESPONSE_COMPRESSION_MIN_SIZE", 1024)
+RESPONSE_GZIP_LEVEL = env_int("RESPONSE_GZIP_LEVEL", 6)
+RESPONSE_BROTLI_QUALITY = env_int("RESPONSE_BROTLI_QUALITY", 4)
+
+# METRICS
+# Per-route request counters and latency histograms, exposed at /metrics.
+
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+
+# QUERY ACCOUNTING
+# Every request gets a Server-Timing header with its statement count and
+# DB time. ACCESS_LOG writes one JSON line per request to the app.access
+# logger; DB_QUERY_BUDGET warns when a request runs more statements.
+
+ACCESS_LOG = env_bool("ACCESS_LOG", True)
+DB_QUERY_BUDGET = env_int("DB_QUERY_BUDGET")
+
+# SLOW QUERY LOG
+# Statements slower than DB_SLOW_QUERY_MS (0 disables) are logged and kept
+# in a ring buffer of DB_SLOW_QUERY_LOG_SIZE entries (GET /admin/slow-queries).
+# A DB_SLOW_QUERY_EXPLAIN_RATE fraction of slow SELECTs also get their plan.
+
+DB_SLOW_QUERY_MS = env_float("DB_SLOW_QUERY_MS", 200.0)
+DB_SLOW_QUERY_EXPLAIN_RATE = env_float("DB_SLOW_QUERY_EXPLAIN_RATE", 0.1)
+DB_SLOW_QUERY_LOG_SIZE = env_int("DB_SLOW_QUERY_LOG_SIZE", 100)
+
+# EXPORT
+# Rows fetched per round-trip (and encoded per NDJSON chunk) by the /export endpoints.
+
+EXPORT_YIELD_PER = env_int("EXPORT_YIELD_PER", 1000)
+
+# MAINTENANCE SWEEPER
+# Background task started by the lifespan. Every SWEEPER_INTERVAL_SECONDS it
+# deletes offers expired for more than OFFER_EXPIRY_GRACE_DAYS that no cart
+# references, expires carts left OPEN longer than CART_OPEN_TTL_HOURS and
+# moves carts paid more than ARCHIVE_PAID_CARTS_AFTER_DAYS ago (0 disables)
+# to the history tables. Idempotency-Key responses older than
+# IDEMPOTENCY_TTL_SECONDS are deleted.
+# Work is done in batches of SWEEPER_BATCH_SIZE rows, at most
+# SWEEPER_MAX_BATCHES per job and pass, with SWEEPER_BATCH_PAUSE_SECONDS
+# between them; batches wait while more than SWEEPER_MAX_IN_FLIGHT requests
+# are being served.
+
+SWEEPER_ENABLED = env_bool("SWEEPER_ENABLED", True)
+SWEEPER_INTERVAL_SECONDS = env_float("SWEEPER_INTERVAL_SECONDS", 300.0)
+SWEEPER_BATCH_SIZE = env_int("SWEEPER_BATCH_SIZE", 500)
+SWEEPER_MAX_BATCHES = env_int("SWEEPER_MAX_BATCHES", 20)
+SWEEPER_BATCH_PAUSE_SECONDS = env_float("SWEEPER_BATCH_PAUSE_SECONDS", 0.5)
+SWEEPER_MAX_IN_FLIGHT = env_int("SWEEPER_MAX_IN_FLIGHT", 8)
+OFFER_EXPIRY_GRACE_DAYS = env_int("OFFER_EXPIRY_GRACE_DAYS", 7)
+CART_OPEN_TTL_HOURS = env_float("CART_OPEN_TTL_HOURS", 72.0)
+ARCHIVE_PAID_CARTS_AFTER_DAYS = env_int("ARCHIVE_PAID_CARTS_AFTER_DAYS", 90)
@@ -1,48 +1,347 @@
-import os
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+)
 
 from sqlalchemy import (
     create_engine,
+    make_url,
     Engine,
 )
 from sqlalchemy.orm import (
     sessionmaker,
     Session,
 )
+from sqlalchemy.ext.asyncio import (
+    create_async_engine,
+    async_sessionmaker,
+    AsyncEngine,
+    AsyncSession,
+)
+from starlette.concurrency import run_in_threadpool
 
-from dotenv import load_dotenv
+from app.config import (
+    DATA_BASE_URL,
+    DATA_BASE_ASYNC,
+    DATA_BASE_ASYNC_URL,
+    DATA_BASE_READ_URLS,
+    DB_REPLICA_RETRY_SECONDS,
+    DB_SLOW_QUERY_MS,
+    DB_SLOW_QUERY_EXPLAIN_RATE,
+)
+from app.db.engine_profiles import (
+    get_engine_profile,
+    build_engine_options,
+    install_sql_logging,
+)
+from app.db.pool_stats import get_pool_status
+from app.db.query_stats import install_query_stats
+from app.db.slow_queries import install_slow_query_log
+from app.db.replicas import (
+    ReplicaSet,
+    RoutingSession,
+    ReadOnlySession,
+)
 
-load_dotenv()
+T = TypeVar("T")
 
-DATA_BASE_URL = os.getenv("DATA_BASE_URL")
+# Sync dialect -> async driver used when DATA_BASE_ASYNC_URL is not given
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
 
 engine: None | Engine = None
+sync_session: None | sessionmaker[Session] = None
+async_engine: None | AsyncEngine = None
+async_session: None | async_sessionmaker[AsyncSession] = None
+replica_set: None | ReplicaSet = None
+async_replica_set: None | ReplicaSet = None
+async_replica_engines: list[AsyncEngine] = []
+read_session: None | sessionmaker[Session] = None
+async_read_session: None | async_sessionmaker[AsyncSession] = None
+read_only_session: None | sessionmaker[Session] = None
+async_read_only_session: None | async_sessionmaker[AsyncSession] = None
+
+def create_configured_engine(url: str) -> Engine:
+
+    """Engine for `url` with the active profile and the SQL logging/accounting hooks."""
+
+    profile = get_engine_profile()
+    new_engine = create_engine(
+        url=url,
+        future=True,
+        **build_engine_options(url, profile),
+    )
+    _install_hooks(new_engine)
+
+    return new_engine
+
+def create_configured_async_engine(url: str) -> AsyncEngine:
+
+    profile = get_engine_profile()
+    new_engine = create_async_engine(
+        url=url,
+        **build_engine_options(url, profile, is_async=True),
+    )
+    _install_hooks(new_engine.sync_engine)
+
+    return new_engine
+
+def _install_hooks(target: Engine) -> None:
+
+    install_sql_logging(target, get_engine_profile())
+    install_query_stats(target)
+    install_slow_query_log(target, DB_SLOW_QUERY_MS, DB_SLOW_QUERY_EXPLAIN_RATE)
 
 def get_engine() -> Engine:
 
     global engine
 
     if engine is None:
-        engine = create_engine(
-            url=DATA_BASE_URL,
-            echo=True,
-            future=True,
-        )
-    
+        engine = create_configured_engine(DATA_BASE_URL)
+
     return engine
 
-session = sessionmaker(
-    bind=get_engine(),
-    expire_on_commit=False,
-    autoflush=False,
-)
+def to_async_url(sync_url: str) -> str:
+
+    url = make_url(sync_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise RuntimeError(
+            f"No async driver known for '{url.drivername}'. Set DATA_BASE_ASYNC_URL explicitly."
+        )
+
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+def get_async_database_url() -> str:
+
+    if DATA_BASE_ASYNC_URL:
+        return DATA_BASE_ASYNC_URL
+
+    return to_async_url(DATA_BASE_URL)
+
+def get_async_engine() -> AsyncEngine:
+
+    global async_engine
+
+    if async_engine is None:
+        async_engine = create_configured_async_engine(get_async_database_url())
+
+    return async_engine
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+
+    global async_session
+
+    if async_session is None:
+        async_session = async_sessionmaker(
+            bind=get_async_engine(),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return async_session
+
+def get_sessionmaker() -> sessionmaker[Session]:
+
+    # Created on first use: importing this module opens no engine or pool
+    global sync_session
+
+    if sync_session is None:
+        sync_session = sessionmaker(
+            bind=get_engine(),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return sync_session
 
 def get_session():
     try:
-        db: Session = session()
+        db: Session = get_sessionmaker()()
         yield db
         db.commit()
     except:
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_session():
+    db: AsyncSession = get_async_sessionmaker()()
+    try:
+        yield db
+        await db.commit()
+    except:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+def get_replica_set() -> ReplicaSet:
+
+    global replica_set
+
+    if replica_set is None:
+        replica_set = ReplicaSet(
+            [create_configured_engine(url) for url in DATA_BASE_READ_URLS],
+            retry_after=DB_REPLICA_RETRY_SECONDS,
+        )
+
+    return replica_set
+
+def get_async_replica_set() -> ReplicaSet:
+
+    # Holds the sync facades of the async engines: that is what Session.get_bind returns
+    global async_replica_set
+
+    if async_replica_set is None:
+        async_replica_engines.extend(create_configured_async_engine(to_async_url(url)) for url in DATA_BASE_READ_URLS)
+        async_replica_set = ReplicaSet(
+            [replica.sync_engine for replica in async_replica_engines],
+            retry_after=DB_REPLICA_RETRY_SECONDS,
+        )
+
+    return async_replica_set
+
+def get_read_sessionmaker() -> sessionmaker[Session]:
+
+    """Transactional sessions for read-mostly traffic: replicas when DATA_BASE_READ_URL is set, the primary otherwise."""
+
+    global read_session
+
+    if not DATA_BASE_READ_URLS:
+        return get_sessionmaker()
+
+    if read_session is None:
+        read_session = sessionmaker(
+            class_=RoutingSession,
+            primary=get_engine(),
+            replicas=get_replica_set(),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return read_session
+
+def get_async_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+
+    global async_read_session
+
+    if not DATA_BASE_READ_URLS:
+        return get_async_sessionmaker()
+
+    if async_read_session is None:
+        async_read_session = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            primary=get_async_engine().sync_engine,
+            replicas=get_async_replica_set(),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return async_read_session
+
+def get_read_only_sessionmaker() -> sessionmaker[Session]:
+
+    """Sessions that only read: AUTOCOMMIT, no flush, routed to the replicas when configured."""
+
+    global read_only_session
+
+    if read_only_session is None:
+        read_only_session = sessionmaker(
+            class_=ReadOnlySession,
+            primary=get_engine(),
+            replicas=get_replica_set() if DATA_BASE_READ_URLS else None,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return read_only_session
+
+def get_async_read_only_sessionmaker() -> async_sessionmaker[AsyncSession]:
+
+    global async_read_only_session
+
+    if async_read_only_session is None:
+        async_read_only_session = async_sessionmaker(
+            sync_session_class=ReadOnlySession,
+            primary=get_async_engine().sync_engine,
+            replicas=get_async_replica_set() if DATA_BASE_READ_URLS else None,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return async_read_only_session
+
+def get_read_only_session():
+    # Nothing to commit or roll back: statements ran in AUTOCOMMIT
+    db: Session = get_read_only_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_only_session():
+    db: AsyncSession = get_async_read_only_sessionmaker()()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+def get_pools_status() -> dict[str, Any]:
+
+    """Runtime counters of every engine created so far, keyed by engine."""
+
+    status: dict[str, Any] = {"profile": get_engine_profile().name}
+    if engine is not None:
+        status["sync"] = get_pool_status(engine)
+    if async_engine is not None:
+        status["async"] = get_pool_status(async_engine.sync_engine)
+    for name, replicas in (("sync_replicas", replica_set), ("async_replicas", async_replica_set)):
+        if replicas is not None:
+            status[name] = [
+                {**health, "pool": get_pool_status(replica)}
+                for health, replica in zip(replicas.status(), replicas.engines)
+            ]
+
+    return status
+
+async def dispose_engines() -> None:
+
+    if async_engine is not None:
+        await async_engine.dispose()
+
+    if engine is not None:
+        engine.dispose()
+
+    for async_replica in async_replica_engines:
+        await async_replica.dispose()
+
+    if replica_set is not None:
+        for replica in replica_set.engines:
+            replica.dispose()
+
+# Session dependencies used by the request handlers, selected by DATA_BASE_ASYNC
+get_db_session = get_async_session if DATA_BASE_ASYNC else get_session
+# Read-only traffic (catalog): no transaction, no commit, replicas when configured
+get_db_read_only_session = get_async_read_only_session if DATA_BASE_ASYNC else get_read_only_session
+
+async def run_in_session(db: Session | AsyncSession, fn: Callable[[Session], T]) -> T:
+
+    """
+    Runs blocking ORM code against either kind of session without blocking the event loop.
+
+    With an AsyncSession the callable runs through `run_sync`, so every statement
+    is awaited on the async driver. With a plain Session it is sent to the threadpool.
+    Anything the response needs must be loaded inside `fn`: lazy loads are not
+    possible once control is back on the event loop.
+    """
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+
+    return await run_in_threadpool(fn, db)
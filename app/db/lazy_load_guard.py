@@ -0,0 +1,46 @@
+"""
+N+1 guard for tests and local runs.
+
+When DB_LAZY_LOAD_GUARD is enabled every lazy relationship load raises
+`LazyLoadError`, so a request that touches an attribute its service did not
+load up front fails loudly instead of silently issuing one query per row.
+Eager loaders (selectinload, joinedload) are not affected.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import (
+    Session,
+    ORMExecuteState,
+)
+
+
+class LazyLoadError(RuntimeError):
+    """Raised when a relationship is lazy-loaded while the guard is installed"""
+
+
+def _forbid_lazy_loads(orm_execute_state: ORMExecuteState) -> None:
+
+    # lazy_loaded_from raises on anything but a SELECT (bulk DML, upserts)
+    if not orm_execute_state.is_select:
+        return
+
+    instance_state = orm_execute_state.lazy_loaded_from
+    if instance_state is None:
+        return
+
+    raise LazyLoadError(
+        f"Lazy load of '{orm_execute_state.loader_strategy_path}' on {instance_state.class_.__name__} "
+        f"(identity {instance_state.identity}). Load it eagerly in the service."
+    )
+
+
+def install_lazy_load_guard() -> None:
+
+    if not event.contains(Session, "do_orm_execute", _forbid_lazy_loads):
+        event.listen(Session, "do_orm_execute", _forbid_lazy_loads)
+
+
+def remove_lazy_load_guard() -> None:
+
+    if event.contains(Session, "do_orm_execute", _forbid_lazy_loads):
+        event.remove(Session, "do_orm_execute", _forbid_lazy_loads)
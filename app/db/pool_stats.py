@@ -0,0 +1,100 @@
+"""
+Connection pool telemetry.
+
+The instrumented pools behave exactly like SQLAlchemy's QueuePool /
+AsyncAdaptedQueuePool, additionally timing how long each checkout waited
+for a free connection. Together with the pool's own checked-out and overflow
+counters this is what `get_pool_status` reports.
+"""
+
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import (
+    Pool,
+    QueuePool,
+    AsyncAdaptedQueuePool,
+)
+
+
+class PoolWaitStats:
+
+    """Cumulative wait-time counters for one pool."""
+
+    __slots__ = ("checkouts", "timeouts", "total_wait", "max_wait")
+
+    def __init__(self):
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float) -> None:
+
+        self.checkouts += 1
+        self.total_wait += waited
+        if waited > self.max_wait:
+            self.max_wait = waited
+
+    def as_dict(self) -> dict[str, Any]:
+
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.total_wait * 1000, 3),
+            "wait_avg_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class WaitTimingPoolMixin:
+
+    def __init__(self, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+
+        self.wait_stats.record(perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(WaitTimingPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(WaitTimingPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_status(engine: Engine) -> dict[str, Any]:
+
+    pool: Pool = engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts overflow from -pool_size until the pool is full
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.as_dict())
+
+    return status
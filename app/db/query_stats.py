@@ -0,0 +1,63 @@
+"""
+Per-request SQL statement accounting.
+
+`install_query_stats(engine)` hooks the engine's cursor events; while a
+`QueryStats` is active in `current_query_stats` (set per request by
+QueryStatsMiddleware) every statement adds one to its count and its
+execution time to its total. The context variable follows the request into
+the threadpool and into `AsyncSession.run_sync`, so both database modes
+are covered. Outside a request the hooks do nothing.
+"""
+
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import (
+    event,
+    Engine,
+)
+
+
+class QueryStats:
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+
+        self.count = 0
+        # Seconds spent executing statements
+        self.duration = 0.0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def install_query_stats(engine: Engine) -> None:
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if current_query_stats.get() is not None:
+            conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def add_to_stats(conn, cursor, statement, parameters, context, executemany):
+        stats = current_query_stats.get()
+        started = conn.info.get("query_started_at")
+        if stats is None or not started:
+            return
+
+        stats.count += 1
+        stats.duration += time.perf_counter() - started.pop()
+
+    @event.listens_for(engine, "handle_error")
+    def add_failed_to_stats(context):
+        # A failed statement never reaches after_cursor_execute; left on the
+        # stack, its start time would live as long as the pooled connection
+        stats = current_query_stats.get()
+        if stats is None or context.connection is None or context.statement is None:
+            return
+
+        started = context.connection.info.get("query_started_at")
+        if started:
+            stats.count += 1
+            stats.duration += time.perf_counter() - started.pop()
@@ -0,0 +1,136 @@
+"""
+Read-replica routing and read-only sessions.
+
+`RoutingSession` backs the read-mostly sessions (`get_read_sessionmaker`,
+used by the exports). Each session picks one replica on its first read
+and keeps it, so everything a request reads comes from the same snapshot.
+Flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE and textual SQL go to
+the primary, and once a session has written, all its later statements go
+there too (read-your-writes within the request).
+
+`ReplicaSet` hands out replicas round-robin, skipping any that failed to
+connect (or lost its connection) in the last `retry_after` seconds. When
+every replica is down, reads fall back to the primary.
+
+`ReadOnlySession` (`get_db_read_only_session`, used by the catalog) routes
+the same way but runs every statement in AUTOCOMMIT, so no BEGIN/COMMIT
+round-trips are spent, and it refuses to flush or execute DML.
+`session.info["read_only"]` marks it for anything that wants to know.
+"""
+
+import time
+from itertools import count
+from typing import Any
+
+from sqlalchemy import (
+    event,
+    Engine,
+)
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+
+class ReplicaSet:
+
+    def __init__(self, engines: list[Engine], retry_after: float):
+
+        self.engines = engines
+        self.retry_after = retry_after
+        self.down_until: dict[Engine, float] = {}
+        self.counter = count()
+
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def choose(self) -> Engine | None:
+
+        now = time.monotonic()
+        start = next(self.counter)
+        for offset in range(len(self.engines)):
+            engine = self.engines[(start + offset) % len(self.engines)]
+            if self.down_until.get(engine, 0) <= now:
+                return engine
+
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+
+        self.down_until[engine] = time.monotonic() + self.retry_after
+
+    def status(self) -> list[dict[str, Any]]:
+
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": self.down_until.get(engine, 0) <= now,
+            }
+            for engine in self.engines
+        ]
+
+    def _on_error(self, context) -> None:
+
+        # Connection failures and dropped connections take the replica out of rotation
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+
+class RoutingSession(Session):
+
+    def __init__(self, primary: Engine, replicas: ReplicaSet | None, **kwargs):
+
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self.replica: Engine | None = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+
+        if self._flushing or self.info.get("wrote") or _is_write(clause):
+            self.info["wrote"] = True
+            return self.primary
+
+        if self.replica is None:
+            self.replica = (self.replicas.choose() if self.replicas else None) or self.primary
+
+        return self.replica
+
+
+class ReadOnlySession(RoutingSession):
+
+    def __init__(self, primary: Engine, replicas: ReplicaSet | None = None, **kwargs):
+
+        super().__init__(primary=primary, replicas=replicas, **kwargs)
+        self.info["read_only"] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+
+        if self._flushing or _is_dml(clause):
+            raise InvalidRequestError("Read-only session: writes must go through get_db_session.")
+
+        return autocommit_engine(super().get_bind(mapper, clause, **kwargs))
+
+
+_autocommit_engines: dict[Engine, Engine] = {}
+
+
+def autocommit_engine(engine: Engine) -> Engine:
+
+    # Shares the engine's pool; only the connections' isolation level differs
+    option_engine = _autocommit_engines.get(engine)
+    if option_engine is None:
+        option_engine = _autocommit_engines[engine] = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    return option_engine
+
+
+def _is_dml(clause) -> bool:
+
+    return isinstance(clause, UpdateBase) or getattr(clause, "_for_update_arg", None) is not None
+
+
+def _is_write(clause) -> bool:
+
+    return _is_dml(clause) or isinstance(clause, TextClause)
@@ -0,0 +1,79 @@
+"""
+Schema check at boot.
+
+`Base.metadata.create_all` inspects every table on every worker start. Instead,
+the fingerprint of the mapped metadata (tables, columns, types, indexes and
+constraints) is stored in the single-row `schema_version` table: when the
+stored value matches, boot costs one primary-key SELECT and `create_all` is
+skipped. Otherwise `create_all` runs and the fingerprint is rewritten.
+
+Like `create_all` itself, this only creates what is missing. Columns and
+indexes added to existing tables are handled by `app.db.upgrades`; any other
+change to an existing table still requires recreating the database or
+applying the DDL.
+"""
+
+import hashlib
+from datetime import (
+    datetime,
+    timezone,
+)
+
+from sqlalchemy import (
+    select,
+    Engine,
+    MetaData,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.table_versions import ensure_table_versions
+from app.db.upgrades import apply_upgrades
+from app.models.schema_version import SchemaVersion
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+
+    digest = hashlib.blake2b(digest_size=16)
+    for table in metadata.sorted_tables:
+        digest.update(repr((
+            table.name,
+            # Enum values are part of the type: a new one must reach the native enum types
+            [
+                (column.name, str(column.type), getattr(column.type, "enums", None), column.nullable, column.primary_key)
+                for column in table.columns
+            ],
+            sorted(str(index.name) for index in table.indexes),
+            sorted(str(constraint.name) for constraint in table.constraints),
+        )).encode())
+
+    return digest.hexdigest()
+
+
+def ensure_schema(engine: Engine) -> bool:
+
+    """Creates the missing schema unless the stored fingerprint is current; returns whether it ran."""
+
+    fingerprint = schema_fingerprint(Base.metadata)
+    if _stored_fingerprint(engine) == fingerprint:
+        return False
+
+    Base.metadata.create_all(bind=engine)
+    apply_upgrades(engine)
+    with Session(bind=engine) as db:
+        ensure_table_versions(db)
+        db.merge(SchemaVersion(id=1, fingerprint=fingerprint, applied_at=datetime.now(timezone.utc)))
+        db.commit()
+
+    return True
+
+
+def _stored_fingerprint(engine: Engine) -> str | None:
+
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(SchemaVersion.fingerprint).where(SchemaVersion.id == 1)).scalar_one_or_none()
+    except DBAPIError:
+        # First boot: schema_version does not exist yet
+        return None
@@ -1,234 +1,415 @@
 # seed_database.py
+"""
+Gerador de dados sintéticos para desenvolvimento e planejamento de capacidade.
+
+    python -m app.db.seed_database                      # base pequena (10 clientes × 24 produtos)
+    python -m app.db.seed_database --clients 50000 --products 5000 \\
+        --offer-density 0.2 --carts 2000000 --seed 7    # base no tamanho de produção
+
+Clientes × produtos × densidade de ofertas × carrinhos históricos (PAID, com
+itens e pagamento). As linhas são geradas em streaming, um cliente por vez, e
+gravadas com `insert()` executemany em lotes de `--batch-size`, com ids
+explícitos para que as chaves estrangeiras não exijam RETURNING. A mesma
+`--seed` gera sempre os mesmos dados (datas relativas ao dia da execução).
+"""
+
+import argparse
+import math
 import random
-from datetime import datetime, timedelta
+import time
+from dataclasses import dataclass
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+    timezone,
+)
+from decimal import Decimal
+from itertools import count
 
-from app.db.connection import get_session, get_engine
-from app.db.base import Base
+from sqlalchemy import (
+    delete,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from app.db.connection import get_sessionmaker, get_engine
+from app.db.schema import ensure_schema
+from app.db.table_versions import (
+    VERSIONED_TABLES,
+    bump_table_versions,
+    ensure_table_versions,
+)
 
 from app.models.product import Product
 from app.models.client import Client
 from app.models.offer import Offer
-from app.models.cart import Cart
+from app.models.cart import (
+    Cart,
+    CartStatus,
+)
 from app.models.cart_item import CartItem
-from app.models.payment import Payment
-
-def seed_data():
-    """Popula o banco com dados de exemplo gerados por IA"""
-    
-    db_generator = get_session()
-    db = next(db_generator)
-    
-    try:
-        # Criar tabelas (se ainda não existem)
-        engine = get_engine()
-        Base.metadata.create_all(bind=engine)
-        
-        # Limpar dados existentes (opcional)
+from app.models.payment import (
+    Payment,
+    PaymentStatus,
+)
+from app.models.idempotency_key import IdempotencyKey
+from app.models.cart_history import CartHistory
+from app.models.cart_item_history import CartItemHistory
+from app.models.payment_history import PaymentHistory
+from app.services.catalog_service.catalog_cache import invalidate_catalog_cache
+
+# Parent tables first: a batch is always written in this order
+GENERATED_MODELS = (Product, Client, Offer, Cart, CartItem, Payment)
+
+# (nome, itens por caixa, preço base em centavos) — supermercado RJ
+PRODUCT_TEMPLATES = [
+    # Alimentos Básicos
+    ("Arroz Branco Tipo 1 - 1kg", 10, 2590),
+    ("Feijão Preto - 1kg", 10, 850),
+    ("Açúcar Refinado - 1kg", 10, 420),
+    ("Óleo de Soja - 900ml", 12, 780),
+    ("Café Torrado e Moído - 500g", 10, 1550),
+    ("Sal Refinado - 1kg", 10, 210),
+    ("Farinha de Trigo - 1kg", 10, 450),
+    ("Macarrão Espaguete - 500g", 20, 320),
+    # Bebidas
+    ("Refrigerante Cola 2L", 6, 650),
+    ("Refrigerante Guaraná 2L", 6, 590),
+    ("Suco de Laranja 1L", 12, 480),
+    ("Água Mineral 500ml", 24, 120),
+    ("Cerveja Lata 350ml", 12, 280),
+    # Higiene e Limpeza
+    ("Sabão em Pó - 1kg", 8, 1290),
+    ("Detergente Líquido 500ml", 24, 250),
+    ("Papel Higiênico 4 rolos", 16, 1590),
+    ("Sabonete 90g", 48, 180),
+    ("Desinfetante 2L", 6, 890),
+    # Laticínios
+    ("Leite Integral 1L", 12, 450),
+    ("Iogurte Natural 170g", 24, 230),
+    ("Manteiga 200g", 12, 1150),
+    # Snacks
+    ("Biscoito Cream Cracker 200g", 20, 380),
+    ("Bolacha Recheada 130g", 24, 420),
+    ("Salgadinho 100g", 30, 550),
+]
+
+CLIENT_PREFIXES = ["Minimercado", "Mercadinho", "Supermercado", "Mercado", "Empório", "Mercearia"]
+NEIGHBORHOODS = [
+    ("Copacabana", "Rua das Flores"),
+    ("Ipanema", "Av. Atlântica"),
+    ("Botafogo", "Rua Voluntários da Pátria"),
+    ("Centro", "Praça da Bandeira"),
+    ("Catete", "Rua do Catete"),
+    ("Vila Isabel", "Rua Teodoro da Silva"),
+    ("Tijuca", "Rua Conde de Bonfim"),
+    ("Flamengo", "Rua Marquês de Abrantes"),
+]
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    clients: int = 10
+    products: int = 24
+    # Fração média dos produtos com oferta para cada cliente
+    offer_density: float = 0.8
+    expired_ratio: float = 0.2
+    # Carrinhos históricos (PAID, com pagamento), distribuídos entre os clientes
+    carts: int = 0
+    max_items_per_cart: int = 8
+    history_days: int = 365
+    batch_size: int = 5000
+    seed: int = 42
+
+
+class BulkWriter:
+
+    """
+    Buffers generated rows and writes them with one executemany per table.
+
+    When `batch_size` rows are pending, every buffer is written in
+    GENERATED_MODELS order (so foreign keys always point to existing rows)
+    and the transaction is committed.
+    """
+
+    def __init__(self, db: Session, batch_size: int):
+
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers: dict[type, list[dict]] = {model: [] for model in GENERATED_MODELS}
+        self.pending = 0
+        self.written: dict[type, int] = {model: 0 for model in GENERATED_MODELS}
+
+    def add(self, model: type, row: dict) -> None:
+
+        self.buffers[model].append(row)
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+
+        for model, rows in self.buffers.items():
+            if rows:
+                self.db.execute(model.__table__.insert(), rows)
+                self.written[model] += len(rows)
+                rows.clear()
+
+        self.db.commit()
+        self.pending = 0
+
+
+def seed_data(config: SeedConfig = SeedConfig()) -> dict[str, int]:
+
+    """Recria produtos, clientes, ofertas, carrinhos e pagamentos a partir de `config`"""
+
+    rng = random.Random(config.seed)
+    started = time.perf_counter()
+
+    # Criar tabelas (se ainda não existem)
+    ensure_schema(get_engine())
+
+    with get_sessionmaker()() as db:
         print("🗑️  Limpando dados antigos...")
-        db.query(Offer).delete()
-        db.query(Product).delete()
-        db.query(Client).delete()
-        db.commit()
-        
-        # ========== PRODUTOS (supermercado RJ) ==========
-        products_data = [
-            # Alimentos Básicos
-            {"ean": "7891234567890", "name": "Arroz Branco Tipo 1 - 1kg", "items_per_box": 10},
-            {"ean": "7891234567891", "name": "Feijão Preto - 1kg", "items_per_box": 10},
-            {"ean": "7891234567892", "name": "Açúcar Refinado - 1kg", "items_per_box": 10},
-            {"ean": "7891234567893", "name": "Óleo de Soja - 900ml", "items_per_box": 12},
-            {"ean": "7891234567894", "name": "Café Torrado e Moído - 500g", "items_per_box": 10},
-            {"ean": "7891234567895", "name": "Sal Refinado - 1kg", "items_per_box": 10},
-            {"ean": "7891234567896", "name": "Farinha de Trigo - 1kg", "items_per_box": 10},
-            {"ean": "7891234567897", "name": "Macarrão Espaguete - 500g", "items_per_box": 20},
-            
-            # Bebidas
-            {"ean": "7891234567898", "name": "Refrigerante Cola 2L", "items_per_box": 6},
-            {"ean": "7891234567899", "name": "Refrigerante Guaraná 2L", "items_per_box": 6},
-            {"ean": "7891234567900", "name": "Suco de Laranja 1L", "items_per_box": 12},
-            {"ean": "7891234567901", "name": "Água Mineral 500ml", "items_per_box": 24},
-            {"ean": "7891234567902", "name": "Cerveja Lata 350ml", "items_per_box": 12},
-            
-            # Higiene e Limpeza
-            {"ean": "7891234567903", "name": "Sabão em Pó - 1kg", "items_per_box": 8},
-            {"ean": "7891234567904", "name": "Detergente Líquido 500ml", "items_per_box": 24},
-            {"ean": "7891234567905", "name": "Papel Higiênico 4 rolos", "items_per_box": 16},
-            {"ean": "7891234567906", "name": "Sabonete 90g", "items_per_box": 48},
-            {"ean": "7891234567907", "name": "Desinfetante 2L", "items_per_box": 6},
-            
-            # Laticínios
-            {"ean": "7891234567908", "name": "Leite Integral 1L", "items_per_box": 12},
-            {"ean": "7891234567909", "name": "Iogurte Natural 170g", "items_per_box": 24},
-            {"ean": "7891234567910", "name": "Manteiga 200g", "items_per_box": 12},
-            
-            # Snacks
-            {"ean": "7891234567911", "name": "Biscoito Cream Cracker 200g", "items_per_box": 20},
-            {"ean": "7891234567912", "name": "Bolacha Recheada 130g", "items_per_box": 24},
-            {"ean": "7891234567913", "name": "Salgadinho 100g", "items_per_box": 30},
-        ]
-        
-        products = []
-        print("📦 Criando produtos...")
-        for data in products_data:
-            product = Product(**data)
-            db.add(product)
-            products.append(product)
-        
-        db.commit()
-        print(f"✅ {len(products)} produtos criados!")
-        
-        # ========== CLIENTES (supermercados RJ) ==========
-        clients_data = [
-            {
-                "name": "Minimercado São Jorge",
-                "address": "Rua das Flores, 123 - Copacabana, Rio de Janeiro - RJ",
-                "cnpj": "12.345.678/0001-91"
-            },
-            {
-                "name": "Mercadinho Estrela",
-                "address": "Av. Atlântica, 456 - Ipanema, Rio de Janeiro - RJ",
-                "cnpj": "23.456.789/0001-82"
-            },
-            {
-                "name": "Supermercado Bom Preço",
-                "address": "Rua Barão de Ipanema, 789 - Botafogo, Rio de Janeiro - RJ",
-                "cnpj": "34.567.890/0001-73"
-            },
-            {
-                "name": "Mercado da Praça",
-                "address": "Praça da Bandeira, 321 - Centro, Rio de Janeiro - RJ",
-                "cnpj": "45.678.901/0001-64"
-            },
-            {
-                "name": "Empório Carioca",
-                "address": "Rua do Catete, 654 - Catete, Rio de Janeiro - RJ",
-                "cnpj": "56.789.012/0001-55"
-            },
-            {
-                "name": "Mercearia do Bairro",
-                "address": "Rua Visconde de Pirajá, 987 - Ipanema, Rio de Janeiro - RJ",
-                "cnpj": "67.890.123/0001-46"
-            },
-            {
-                "name": "Supermercado Família",
-                "address": "Av. Nossa Senhora de Copacabana, 1234 - Copacabana, RJ",
-                "cnpj": "78.901.234/0001-37"
-            },
-            {
-                "name": "Mercadinho Vila Isabel",
-                "address": "Rua Teodoro da Silva, 567 - Vila Isabel, Rio de Janeiro - RJ",
-                "cnpj": "89.012.345/0001-28"
-            },
-            {
-                "name": "Mercado Tijuca",
-                "address": "Rua Conde de Bonfim, 890 - Tijuca, Rio de Janeiro - RJ",
-                "cnpj": "90.123.456/0001-19"
-            },
-            {
-                "name": "Empório Zona Sul",
-                "address": "Rua Voluntários da Pátria, 432 - Botafogo, Rio de Janeiro - RJ",
-                "cnpj": "01.234.567/0001-00"
-            },
-        ]
-        
-        clients = []
-        print("👥 Criando clientes...")
-        for data in clients_data:
-            client = Client(**data)
-            db.add(client)
-            clients.append(client)
-        
+        _clear(db)
+        ensure_table_versions(db)
         db.commit()
-        print(f"✅ {len(clients)} clientes criados!")
-        
-        # ========== OFERTAS (preços específicos por cliente) ==========
-        print("💰 Criando ofertas personalizadas...")
-        offers = []
-        base_prices = {
-            "Arroz": 25.90,
-            "Feijão": 8.50,
-            "Açúcar": 4.20,
-            "Óleo": 7.80,
-            "Café": 15.50,
-            "Sal": 2.10,
-            "Farinha": 4.50,
-            "Macarrão": 3.20,
-            "Refrigerante Cola": 6.50,
-            "Refrigerante Guaraná": 5.90,
-            "Suco": 4.80,
-            "Água": 1.20,
-            "Cerveja": 2.80,
-            "Sabão": 12.90,
-            "Detergente": 2.50,
-            "Papel": 15.90,
-            "Sabonete": 1.80,
-            "Desinfetante": 8.90,
-            "Leite": 4.50,
-            "Iogurte": 2.30,
-            "Manteiga": 11.50,
-            "Biscoito": 3.80,
-            "Bolacha": 4.20,
-            "Salgadinho": 5.50,
-        }
-        
-        for client in clients:
-            # Cada cliente tem ofertas para produtos aleatórios
-            num_offers = random.randint(15, len(products))
-            selected_products = random.sample(products, num_offers)
-            
-            for product in selected_products:
-                # Encontrar preço base pelo nome do produto
-                base_price = 5.00  # default
-                for key, price in base_prices.items():
-                    if key in product.name:
-                        base_price = price
-                        break
-                
-                # Variar preço ±15% por cliente (ofertas personalizadas)
-                variation = random.uniform(0.85, 1.15)
-                unit_price = round(base_price * variation, 2)
-                
-                # 20% das ofertas serão expiradas
-                if random.random() < 0.2:
-                    # Oferta expirada entre 1 e 30 dias atrás
-                    days_expired = random.randint(1, 30)
-                    valid_until = datetime.now() - timedelta(days=days_expired)
-                else:
-                    # Oferta válida entre 30 e 90 dias no futuro
-                    days_valid = random.randint(30, 90)
-                    valid_until = datetime.now() + timedelta(days=days_valid)
-                
-                offer = Offer(
-                    product_id=product.id,
-                    client_id=client.id,
-                    unit_price=unit_price,
-                    valid_until=valid_until
-                )
-                db.add(offer)
-                offers.append(offer)
-        
+
+        writer = BulkWriter(db, batch_size=config.batch_size)
+
+        print(f"📦 Criando {config.products} produtos...")
+        base_prices = _generate_products(writer, rng, config)
+
+        print(f"👥 Criando {config.clients} clientes com ofertas e histórico...")
+        offer_ids, cart_ids, cart_item_ids, payment_ids = count(1), count(1), count(1), count(1)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for client_id in range(1, config.clients + 1):
+            _generate_client(writer, rng, client_id)
+            offers = _generate_offers(writer, rng, config, client_id, base_prices, offer_ids)
+            _generate_carts(
+                writer,
+                rng,
+                config,
+                client_id=client_id,
+                carts=_carts_for_client(config, client_id),
+                offers=offers,
+                now=now,
+                ids=(cart_ids, cart_item_ids, payment_ids),
+            )
+
+        writer.flush()
+
+        # Bulk statements are already tracked, the explicit bump also covers a run that wrote nothing
+        bump_table_versions(db, VERSIONED_TABLES)
+        _sync_sequences(db)
         db.commit()
-        print(f"✅ {len(offers)} ofertas criadas!")
-        
-        print("\n" + "="*50)
-        print("🎉 DATABASE POPULADO COM SUCESSO!")
-        print("="*50)
-        print(f"📊 Resumo:")
-        print(f"   📦 Produtos: {len(products)}")
-        print(f"   👥 Clientes: {len(clients)}")
-        print(f"   💰 Ofertas:  {len(offers)}")
-        print("="*50)
-        
-    except Exception as e:
-        print(f"\n❌ Erro ao popular banco: {e}")
-        db.rollback()
-        raise
-    finally:
-        # Fechar a sessão usando o generator
-        try:
-            next(db_generator)
-        except StopIteration:
-            pass
+
+    invalidate_catalog_cache()
+
+    summary = {model.__tablename__: written for model, written in writer.written.items()}
+    elapsed = time.perf_counter() - started
+    total = sum(summary.values())
+
+    print("\n" + "="*50)
+    print("🎉 DATABASE POPULADO COM SUCESSO!")
+    print("="*50)
+    print(f"📊 Resumo (seed {config.seed}):")
+    for table, written in summary.items():
+        print(f"   {table:<12} {written:>12,}")
+    print(f"   ⏱️  {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} linhas/s)")
+    print("="*50)
+
+    return summary
+
+
+def _clear(db: Session) -> None:
+
+    # Archived orders go too: the generated carts reuse their ids
+    for model in (IdempotencyKey, PaymentHistory, CartItemHistory, CartHistory, *reversed(GENERATED_MODELS)):
+        db.execute(delete(model))
+
+
+def _generate_products(writer: BulkWriter, rng: random.Random, config: SeedConfig) -> list[int]:
+
+    # Base price in cents, indexed by product_id - 1
+    base_prices = []
+    for index in range(config.products):
+        name, items_per_box, price = PRODUCT_TEMPLATES[index % len(PRODUCT_TEMPLATES)]
+        variant = index // len(PRODUCT_TEMPLATES)
+        if variant:
+            name = f"{name} (variação {variant})"
+            price = round(price * rng.uniform(0.9, 1.1))
+
+        writer.add(Product, {
+            "id": index + 1,
+            "ean": f"789{index + 1:010d}",
+            "name": name,
+            "items_per_box": items_per_box,
+        })
+        base_prices.append(price)
+
+    return base_prices
+
+
+def _generate_client(writer: BulkWriter, rng: random.Random, client_id: int) -> None:
+
+    neighborhood, street = rng.choice(NEIGHBORHOODS)
+    writer.add(Client, {
+        "id": client_id,
+        "name": f"{rng.choice(CLIENT_PREFIXES)} {neighborhood} {client_id}",
+        "cnpj": f"{client_id:08d}0001{client_id % 97:02d}",
+        "address": f"{street}, {rng.randint(1, 3000)} - {neighborhood}, Rio de Janeiro - RJ",
+    })
+
+
+def _generate_offers(
+    writer: BulkWriter,
+    rng: random.Random,
+    config: SeedConfig,
+    client_id: int,
+    base_prices: list[int],
+    ids: count,
+) -> list[tuple[int, int]]:
+
+    """Writes the client's offers and returns them as (offer_id, unit_price_cents)"""
+
+    mean = config.products * config.offer_density
+    if mean <= 0:
+        return []
+
+    size = min(config.products, rng.randint(max(1, int(mean * 0.8)), max(1, math.ceil(mean * 1.2))))
+    today = date.today()
+
+    offers = []
+    for product_id in sorted(rng.sample(range(1, config.products + 1), size)):
+
+        # Variar preço ±15% por cliente (ofertas personalizadas)
+        price = max(1, round(base_prices[product_id - 1] * rng.uniform(0.85, 1.15)))
+        if rng.random() < config.expired_ratio:
+            valid_until = today - timedelta(days=rng.randint(1, 30))
+        else:
+            valid_until = today + timedelta(days=rng.randint(30, 90))
+
+        offer_id = next(ids)
+        writer.add(Offer, {
+            "id": offer_id,
+            "client_id": client_id,
+            "product_id": product_id,
+            "unit_price": _cents(price),
+            "valid_until": valid_until,
+        })
+        offers.append((offer_id, price))
+
+    return offers
+
+
+def _generate_carts(
+    writer: BulkWriter,
+    rng: random.Random,
+    config: SeedConfig,
+    client_id: int,
+    carts: int,
+    offers: list[tuple[int, int]],
+    now: datetime,
+    ids: tuple[count, count, count],
+) -> None:
+
+    if not offers:
+        return
+
+    cart_ids, cart_item_ids, payment_ids = ids
+    history = timedelta(days=config.history_days).total_seconds()
+    for _ in range(carts):
+
+        cart_id = next(cart_ids)
+        created_at = now - timedelta(seconds=rng.uniform(0, history))
+        lines = rng.sample(offers, rng.randint(1, min(config.max_items_per_cart, len(offers))))
+        quantities = [rng.randint(1, 20) for _ in lines]
+        subtotal = sum(quantity * price for quantity, (_, price) in zip(quantities, lines))
+
+        writer.add(Cart, {
+            "id": cart_id,
+            "client_id": client_id,
+            "status": CartStatus.PAID,
+            "created_at": created_at,
+            "subtotal": _cents(subtotal),
+            "item_count": sum(quantities),
+        })
+        for quantity, (offer_id, price) in zip(quantities, lines):
+            writer.add(CartItem, {
+                "id": next(cart_item_ids),
+                "cart_id": cart_id,
+                "offer_id": offer_id,
+                "quantity": quantity,
+                "unit_price_snapshot": _cents(price),
+            })
+        writer.add(Payment, {
+            "id": next(payment_ids),
+            "cart_id": cart_id,
+            "status": PaymentStatus.PAID,
+            "amount": _cents(subtotal),
+            "created_at": created_at + timedelta(minutes=rng.randint(1, 120)),
+        })
+
+
+def _carts_for_client(config: SeedConfig, client_id: int) -> int:
+
+    # Spreads config.carts evenly, the first clients absorbing the remainder
+    base, remainder = divmod(config.carts, config.clients)
+    return base + (1 if client_id <= remainder else 0)
+
+
+def _cents(value: int) -> Decimal:
+
+    return Decimal(value).scaleb(-2)
+
+
+def _sync_sequences(db: Session) -> None:
+
+    # Rows were written with explicit ids, PostgreSQL sequences must be moved past them
+    if db.get_bind().dialect.name != "postgresql":
+        return
+
+    for model in GENERATED_MODELS:
+        table = model.__tablename__
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {table}"
+        ))
+
+
+def parse_args() -> SeedConfig:
+
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(
+        description="Gera dados sintéticos (clientes × produtos × ofertas × histórico de carrinhos)",
+    )
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument("--offer-density", type=float, default=defaults.offer_density,
+                        help="fração média dos produtos com oferta por cliente (0-1)")
+    parser.add_argument("--expired-ratio", type=float, default=defaults.expired_ratio,
+                        help="fração das ofertas já expiradas (0-1)")
+    parser.add_argument("--carts", type=int, default=defaults.carts,
+                        help="total de carrinhos históricos pagos")
+    parser.add_argument("--max-items-per-cart", type=int, default=defaults.max_items_per_cart)
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size,
+                        help="linhas por executemany/commit")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    config = SeedConfig(**vars(args))
+    if config.clients < 1 or config.products < 1:
+        parser.error("--clients e --products devem ser >= 1")
+    if not 0 <= config.offer_density <= 1 or not 0 <= config.expired_ratio <= 1:
+        parser.error("--offer-density e --expired-ratio devem estar entre 0 e 1")
+    if config.carts < 0 or config.max_items_per_cart < 1 or config.history_days < 1 or config.batch_size < 1:
+        parser.error("--carts >= 0; --max-items-per-cart, --history-days e --batch-size >= 1")
+
+    return config
+
 
 if __name__ == "__main__":
-    seed_data()
\ No newline at end of file
+    seed_data(parse_args())
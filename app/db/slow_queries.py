@@ -0,0 +1,185 @@
+"""
+Slow query log.
+
+`install_slow_query_log(engine, ...)` times every statement executed by
+`engine`. Statements slower than the threshold are logged on `app.db.slow`
+and kept in a bounded ring buffer (`slow_query_log`) with:
+
+- the shape of their bound parameters (types only, never values)
+- the application function that issued them, e.g.
+  `CartService._check_existing_cart_in_progress`
+- for a sampled fraction of SELECTs, the plan from `EXPLAIN` (PostgreSQL,
+  MySQL) or `EXPLAIN QUERY PLAN` (SQLite), run on the same connection
+"""
+
+import logging
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import Any
+
+from sqlalchemy import (
+    event,
+    Engine,
+)
+
+from app.config import DB_SLOW_QUERY_LOG_SIZE
+
+slow_logger = logging.getLogger("app.db.slow")
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+}
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    caller: str | None
+    plan: list[str] | None = None
+    explain_error: str | None = None
+
+
+class SlowQueryLog:
+
+    """Bounded ring buffer of the most recent slow statements."""
+
+    def __init__(self, maxlen: int):
+
+        self.entries: deque[SlowQuery] = deque(maxlen=maxlen)
+
+    def record(self, entry: SlowQuery) -> None:
+
+        self.entries.append(entry)
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+
+        # Newest first; list() of a deque is atomic under the GIL
+        entries = list(self.entries)[::-1]
+        return [asdict(entry) for entry in entries[:limit]]
+
+    def clear(self) -> None:
+
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(maxlen=DB_SLOW_QUERY_LOG_SIZE)
+
+
+def install_slow_query_log(engine: Engine, threshold_ms: float, explain_rate: float) -> None:
+
+    if threshold_ms <= 0:
+        return
+
+    threshold = threshold_ms / 1000
+    explain_prefix = EXPLAIN_PREFIXES.get(engine.dialect.name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if not conn.info.get("explaining"):
+            conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_if_slow(conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get("explaining"):
+            return
+
+        started = conn.info.get("slow_query_started_at")
+        if not started:
+            return
+
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < threshold:
+            return
+
+        plan, explain_error = None, None
+        if (
+            explain_prefix is not None
+            and not executemany
+            and statement.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+            and random.random() < explain_rate
+        ):
+            plan, explain_error = _explain(conn, explain_prefix + statement, parameters)
+
+        entry = SlowQuery(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=round(elapsed * 1000, 3),
+            statement=statement,
+            parameters=parameter_shape(parameters, executemany),
+            caller=_caller(),
+            plan=plan,
+            explain_error=explain_error,
+        )
+        slow_query_log.record(entry)
+        slow_logger.warning("slow query %.1fms in %s: %s", entry.duration_ms, entry.caller, statement)
+
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(context):
+        # A failed statement never reaches after_cursor_execute; left on the
+        # stack, its start time would live as long as the pooled connection
+        conn = context.connection
+        if conn is None or context.statement is None or conn.info.get("explaining"):
+            return
+
+        started = conn.info.get("slow_query_started_at")
+        if started:
+            started.pop()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "shape": parameter_shape(rows[0]) if rows else None}
+
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+
+    return type(parameters).__name__
+
+
+def _explain(conn, statement: str, parameters: Any) -> tuple[list[str] | None, str | None]:
+
+    conn.info["explaining"] = True
+    try:
+        if conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT":
+            rows = conn.exec_driver_sql(statement, parameters).all()
+        else:
+            # A failed statement would abort a PostgreSQL transaction, hence the savepoint
+            with conn.begin_nested():
+                rows = conn.exec_driver_sql(statement, parameters).all()
+        return [" | ".join(str(column) for column in row) for row in rows], None
+    except Exception as exc:
+        return None, f"{exc.__class__.__name__}: {exc}"
+    finally:
+        conn.info["explaining"] = False
+
+
+def _caller() -> str | None:
+
+    # Innermost frame of application code that is not this module
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and module != __name__:
+            return f"{frame.f_code.co_qualname} ({module}:{frame.f_lineno})"
+        frame = frame.f_back
+
+    return None
@@ -0,0 +1,158 @@
+"""
+Per-table change counters for the catalog tables.
+
+Every transaction that writes to `products`, `customers` or `offers` (through
+the unit of work or through bulk INSERT/UPDATE/DELETE statements) increments
+the matching row of `table_versions` before it commits. Reading one tiny row
+is therefore enough to know whether a catalog resource changed, which is what
+the catalog ETags and the cache invalidation are built on.
+
+Writes made with raw SQL outside a Session must call `bump_table_versions`.
+"""
+
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Callable,
+    Iterable,
+    Mapping,
+)
+
+from sqlalchemy import (
+    event,
+    inspect,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.orm import (
+    Session,
+    ORMExecuteState,
+)
+
+from app.models.table_version import TableVersion
+
+VERSIONED_TABLES = frozenset({"products", "customers", "offers"})
+
+# Called with {table: version} of the versioned tables a transaction committed
+CommitListener = Callable[[Mapping[str, int]], None]
+_commit_listeners: list[CommitListener] = []
+
+
+def on_tables_committed(listener: CommitListener) -> CommitListener:
+
+    """Registers `listener` to be called with the versioned tables (and their new versions) of each commit."""
+
+    _commit_listeners.append(listener)
+    return listener
+
+
+def get_table_versions(session: Session, tables: Iterable[str]) -> dict[str, tuple[int, float]]:
+
+    """{table: (version, updated_at timestamp)}; the timestamp tells a recreated database apart."""
+
+    query = select(TableVersion).where(TableVersion.table_name.in_(list(tables)))
+    return {
+        row.table_name: (row.version, round(row.updated_at.timestamp(), 6))
+        for row in session.scalars(query)
+    }
+
+
+def bump_table_versions(session: Session, tables: Iterable[str]) -> None:
+
+    tables = sorted(set(tables))
+    if not tables:
+        return
+
+    now = datetime.now(timezone.utc)
+    result = session.execute(
+        update(TableVersion)
+        .where(TableVersion.table_name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == len(tables):
+        return
+
+    existing = set(session.scalars(select(TableVersion.table_name).where(TableVersion.table_name.in_(tables))))
+    session.execute(
+        insert(TableVersion),
+        [
+            {"table_name": table, "version": 1, "updated_at": now}
+            for table in tables
+            if table not in existing
+        ],
+    )
+
+
+def ensure_table_versions(session: Session) -> None:
+
+    existing = set(session.scalars(select(TableVersion.table_name)))
+    missing = VERSIONED_TABLES - existing
+    if missing:
+        session.execute(
+            insert(TableVersion),
+            [{"table_name": table, "version": 0} for table in sorted(missing)],
+        )
+
+
+def _changed_tables(session: Session) -> set[str]:
+
+    return session.info.setdefault("changed_tables", set())
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flushed_writes(session: Session, flush_context, instances) -> None:
+
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table_name = inspect(instance).mapper.local_table.name
+        if table_name in VERSIONED_TABLES:
+            _changed_tables(session).add(table_name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state: ORMExecuteState) -> None:
+
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush, so they are tracked here
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    table_name = orm_execute_state.statement.table.name
+    if table_name in VERSIONED_TABLES:
+        _changed_tables(orm_execute_state.session).add(table_name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session) -> None:
+
+    # Flush first so writes still pending are counted in this transaction
+    session.flush()
+    if session.info.get("changed_tables"):
+        tables = session.info["changed_tables"]
+        bump_table_versions(session, tables)
+        session.info["committed_versions"] = dict(
+            session.execute(
+                select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+            ).tuples().all()
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+
+    session.info.pop("changed_tables", None)
+    versions = session.info.pop("committed_versions", None)
+    if not versions:
+        return
+
+    for listener in _commit_listeners:
+        listener(versions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tracked_writes(session: Session) -> None:
+
+    session.info.pop("changed_tables", None)
+    session.info.pop("committed_versions", None)
@@ -0,0 +1,143 @@
+"""
+In-place upgrades of databases created by earlier versions.
+
+`create_all` only creates missing tables. Columns added later to an existing
+table are listed in COLUMN_UPGRADES: `apply_upgrades` (run by `ensure_schema`
+whenever the schema fingerprint changed) adds each missing one with
+`ALTER TABLE ... ADD COLUMN` and then runs its backfill, once, in the same
+transaction. Indexes added later to an existing table are listed in
+INDEX_UPGRADES and created when the reflected table does not have them.
+
+Values added to a Python enum mapped with `SQLEnum` (e.g. CartStatus.EXPIRED)
+are added to the native enum types too: `ALTER TYPE ... ADD VALUE` on
+PostgreSQL, `ALTER TABLE ... MODIFY COLUMN` on MySQL. SQLite stores enums as
+plain VARCHAR and needs nothing.
+"""
+
+from typing import Callable
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Enum as SQLEnum,
+    Inspector,
+    func,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.schema import CreateColumn
+
+from app.db.base import Base
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+
+
+def _backfill_cart_totals(conn: Connection) -> None:
+
+    # The server default (0) is wrong for carts that already have items
+    carts, items = Cart.__table__, CartItem.__table__
+    of_cart = items.c.cart_id == carts.c.id
+    conn.execute(
+        update(carts).values(
+            subtotal=func.coalesce(
+                select(func.sum(items.c.quantity * items.c.unit_price_snapshot)).where(of_cart).scalar_subquery(),
+                0,
+            ),
+            item_count=func.coalesce(
+                select(func.sum(items.c.quantity)).where(of_cart).scalar_subquery(),
+                0,
+            ),
+        )
+    )
+
+
+# (table, column, backfill run after the column is added)
+COLUMN_UPGRADES: tuple[tuple[str, str, Callable[[Connection], None] | None], ...] = (
+    ("carts", "subtotal", _backfill_cart_totals),
+    ("carts", "item_count", _backfill_cart_totals),
+)
+
+# (table, index name) of indexes declared on the models
+INDEX_UPGRADES: tuple[tuple[str, str], ...] = (
+    ("offers", "ix_offers_client_id_valid_until"),
+)
+
+
+def apply_upgrades(engine: Engine) -> list[str]:
+
+    """Adds the missing enum values, upgrade columns (with their backfills) and indexes; returns what was added."""
+
+    inspector = inspect(engine)
+    added = _add_enum_values(engine, inspector)
+
+    existing = {}
+    backfills = []
+    with engine.begin() as conn:
+        for table_name, column_name, backfill in COLUMN_UPGRADES:
+            if table_name not in existing:
+                existing[table_name] = {column["name"] for column in inspector.get_columns(table_name)}
+            if column_name in existing[table_name]:
+                continue
+
+            table = Base.metadata.tables[table_name]
+            ddl = CreateColumn(table.c[column_name]).compile(dialect=engine.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {engine.dialect.identifier_preparer.format_table(table)} ADD COLUMN {ddl}")
+            existing[table_name].add(column_name)
+            added.append(f"{table_name}.{column_name}")
+            if backfill is not None and backfill not in backfills:
+                backfills.append(backfill)
+
+        for backfill in backfills:
+            backfill(conn)
+
+        indexes = {}
+        for table_name, index_name in INDEX_UPGRADES:
+            if table_name not in indexes:
+                indexes[table_name] = {index["name"] for index in inspector.get_indexes(table_name)}
+            if index_name in indexes[table_name]:
+                continue
+
+            index = next(index for index in Base.metadata.tables[table_name].indexes if index.name == index_name)
+            index.create(conn, checkfirst=True)
+            added.append(index_name)
+
+    return added
+
+
+def _add_enum_values(engine: Engine, inspector: Inspector) -> list[str]:
+
+    dialect, preparer = engine.dialect, engine.dialect.identifier_preparer
+    native_enums = [
+        (table, column)
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, SQLEnum) and column.type.native_enum
+    ]
+    added = []
+
+    if dialect.name == "postgresql":
+        labels = {enum["name"]: enum["labels"] for enum in inspector.get_enums()}
+        # ADD VALUE cannot be used by the transaction that adds it, hence AUTOCOMMIT
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for enum_type in {column.type.name: column.type for _, column in native_enums}.values():
+                for value in enum_type.enums:
+                    if value not in labels.get(enum_type.name, enum_type.enums):
+                        conn.exec_driver_sql(
+                            f"ALTER TYPE {preparer.format_type(enum_type)} ADD VALUE IF NOT EXISTS '{value}'"
+                        )
+                        added.append(f"{enum_type.name}.{value}")
+
+    elif dialect.name in ("mysql", "mariadb"):
+        with engine.begin() as conn:
+            for table, column in native_enums:
+                reflected = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+                current = getattr(reflected.get(column.name), "enums", None)
+                if current is None or set(column.type.enums) <= set(current):
+                    continue
+
+                ddl = CreateColumn(column).compile(dialect=dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} MODIFY COLUMN {ddl}")
+                added.extend(f"{table.name}.{column.name}.{value}" for value in set(column.type.enums) - set(current))
+
+    return added
@@ -1,9 +1,10 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.connection import get_session
-from app.services.cart_service.CartService import CartService
+from app.db.connection import get_db_session
+from app.services.cart_service.AsyncCartService import AsyncCartService
 
 
-def get_cart_service(session: Session = Depends(get_session)) -> CartService:
-    return CartService(session=session)
\ No newline at end of file
+def get_cart_service(session: AsyncSession | Session = Depends(get_db_session)) -> AsyncCartService:
+    return AsyncCartService(session=session)
\ No newline at end of file
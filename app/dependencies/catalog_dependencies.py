@@ -1,8 +1,9 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.connection import get_session
-from app.services.catalog_service.CatalogService import CatalogService
+from app.db.connection import get_db_read_only_session
+from app.services.catalog_service.AsyncCatalogService import AsyncCatalogService
 
-def get_catalog_service(session: Session = Depends(get_session)) -> CatalogService:
-    return CatalogService(session=session)
\ No newline at end of file
+def get_catalog_service(session: AsyncSession | Session = Depends(get_db_read_only_session)) -> AsyncCatalogService:
+    return AsyncCatalogService(session=session)
\ No newline at end of file
@@ -1,9 +1,10 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.connection import get_session
-from app.services.checkout_service.CheckoutService import CheckoutService
+from app.db.connection import get_db_session
+from app.services.checkout_service.AsyncCheckoutService import AsyncCheckoutService
 
 
-def get_checkout_service(session: Session = Depends(get_session)) -> CheckoutService:
-    return CheckoutService(session=session)
\ No newline at end of file
+def get_checkout_service(session: AsyncSession | Session = Depends(get_db_session)) -> AsyncCheckoutService:
+    return AsyncCheckoutService(session=session)
\ No newline at end of file
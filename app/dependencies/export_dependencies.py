@@ -0,0 +1,5 @@
+from app.services.export_service.ExportService import ExportService
+
+def get_export_service() -> ExportService:
+    # Exports open their own session: a streamed body outlives request-scoped dependencies
+    return ExportService()
@@ -0,0 +1,10 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_db_session
+from app.services.idempotency_service.AsyncIdempotencyService import AsyncIdempotencyService
+
+
+def get_idempotency_service(session: AsyncSession | Session = Depends(get_db_session)) -> AsyncIdempotencyService:
+    return AsyncIdempotencyService(session=session)
\ No newline at end of file
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import get_db_session
+from app.services.order_service.AsyncOrderService import AsyncOrderService
+
+
+def get_order_service(session: AsyncSession | Session = Depends(get_db_session)) -> AsyncOrderService:
+    # Primary, not the replicas: an order is typically fetched right after it was paid
+    return AsyncOrderService(session=session)
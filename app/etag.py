@@ -0,0 +1,31 @@
+"""
+Helpers for HTTP entity tags and conditional GET (If-None-Match).
+"""
+
+import hashlib
+from typing import Any
+
+
+def make_etag(*parts: Any) -> str:
+
+    """Builds a weak ETag from the values a representation depends on."""
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110, 13.1.2)."""
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -76,4 +76,24 @@ class OfferDoesNotBelongToClientError(BusinessException):
 class ExpiredOfferError(BusinessException):
     """Raised when trying to use an expired offer"""
     status_code = 400
-    detail = "The offer has expired."
\ No newline at end of file
+    detail = "The offer has expired."
+
+
+# IDEMPOTENCY EXCEPTIONS
+
+class IdempotencyKeyReusedError(BusinessException):
+    """Raised when an Idempotency-Key is sent again for a different request"""
+    status_code = 422
+    detail = "The Idempotency-Key was already used for a different request."
+
+class IdempotencyRequestInProgressError(BusinessException):
+    """Raised when a concurrent request with the same Idempotency-Key stored its response first"""
+    status_code = 409
+    detail = "A request with this Idempotency-Key is already being processed. Retry to get its response."
+
+# EXPORT EXCEPTIONS
+
+class InvalidDateRangeError(BusinessException):
+    """Raised when an export's `since` is not before its `until`"""
+    status_code = 422
+    detail = "'since' must be earlier than 'until'."
@@ -1,35 +1,78 @@
+import time
+
+# Measured from here: the "import" phase of the startup report
+_import_started = time.perf_counter()
+
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
 from app.exceptions import BusinessException
+from app.config import (
+    DB_LAZY_LOAD_GUARD,
+    METRICS_ENABLED,
+    SWEEPER_ENABLED,
+    ACCESS_LOG,
+    DB_QUERY_BUDGET,
+    RESPONSE_COMPRESSION_MIN_SIZE,
+    RESPONSE_GZIP_LEVEL,
+    RESPONSE_BROTLI_QUALITY,
+)
+from app.db.lazy_load_guard import install_lazy_load_guard
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.metrics import (
+    MetricsMiddleware,
+    request_metrics,
+    mark_business_error,
+)
+from app.responses import FastJSONResponse
+from app.startup import startup_report
+from app.sweeper import sweeper
 
 from app.routers.cart_router import cart_router
 from app.routers.catalog_router import catalog_router
 from app.routers.checkout_router import checkout_router
+from app.routers.admin_router import admin_router
+from app.routers.export_router import export_router
+from app.routers.order_router import order_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia startup e shutdown da aplicação"""
     # Startup
-    from app.db.connection import get_engine
-    from app.db.base import Base
+    from app.db.connection import get_engine, dispose_engines
+    from app.db.schema import ensure_schema
+    from app.db.engine_profiles import get_engine_profile
+    from app.config import DATA_BASE_ASYNC
     import app.models.cart
     import app.models.product
     import app.models.cart_item
     import app.models.payment
     import app.models.offer
     import app.models.client
+    import app.models.cart_history
+    import app.models.cart_item_history
+    import app.models.payment_history
+    import app.models.idempotency_key
+    import app.models.table_version
+    import app.models.schema_version
 
-
-    
     print("🚀 Iniciando Clubbi E-commerce API...")
     
-    # Criar tabelas
-    engine = get_engine()
-    Base.metadata.create_all(bind=engine)
-    print("✅ Tabelas do banco criadas/verificadas")
+    # Criar tabelas apenas quando o schema registrado em schema_version está desatualizado
+    with startup_report.phase("engine"):
+        engine = get_engine()
+    with startup_report.phase("schema"):
+        startup_report.schema_created = ensure_schema(engine)
+    print(f"✅ Tabelas do banco {'criadas/atualizadas' if startup_report.schema_created else 'já atualizadas (create_all ignorado)'}")
+    print(f"🔌 Modo do banco: {'async (AsyncSession)' if DATA_BASE_ASYNC else 'sync (Session)'} | perfil: {get_engine_profile().name}")
+    print(f"⏱️  Startup: {startup_report.summary()}")
+
+    if SWEEPER_ENABLED:
+        sweeper.start()
+        print(f"🧹 Sweeper de manutenção a cada {sweeper.interval:.0f}s")
     
     print("📚 Documentação disponível em: http://localhost:8000/docs")
     print("-" * 50)
@@ -39,6 +82,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("-" * 50)
     print("👋 Encerrando Clubbi E-commerce API...")
+    await sweeper.stop()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -48,18 +93,44 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=RESPONSE_COMPRESSION_MIN_SIZE,
+    gzip_level=RESPONSE_GZIP_LEVEL,
+    brotli_quality=RESPONSE_BROTLI_QUALITY,
 )
 
+app.add_middleware(
+    QueryStatsMiddleware,
+    budget=DB_QUERY_BUDGET,
+    access_log=ACCESS_LOG,
+)
+
+# Added last so it is the outermost middleware and times compression too
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+
+if DB_LAZY_LOAD_GUARD:
+    install_lazy_load_guard()
+
 
 #Include routers
 app.include_router(cart_router, prefix="/api/v1", tags=["Cart"])
 app.include_router(catalog_router, prefix="/api/v1", tags=["Catalog"])
 app.include_router(checkout_router, prefix="/api/v1", tags=["Checkout"])
+app.include_router(export_router, prefix="/api/v1", tags=["Export"])
+app.include_router(order_router, prefix="/api/v1", tags=["Orders"])
+app.include_router(admin_router, prefix="/api/v1", tags=["Admin"])
 
 
 @app.exception_handler(BusinessException)
-def business_exception_handler(_: Request, exc: BusinessException):
-    return JSONResponse(
+def business_exception_handler(request: Request, exc: BusinessException):
+    mark_business_error(request.scope, exc)
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.__class__.__name__,
@@ -79,4 +150,13 @@ def root():
 
 @app.get("/health", tags=["Health"])
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # async: rendered on the event loop, the only thread that updates the counters
+    return PlainTextResponse(request_metrics.render() + sweeper.render(), media_type="text/plain; version=0.0.4")
+
+
+startup_report.record("import", time.perf_counter() - _import_started)
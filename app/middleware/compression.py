@@ -0,0 +1,146 @@
+"""
+Negotiated response compression.
+
+Bodies of at least `minimum_size` bytes are compressed with Brotli when the
+client accepts `br` and the `brotli` package is installed, and with gzip
+otherwise (delegated to Starlette's GZipMiddleware). Streaming responses are
+compressed chunk by chunk; responses that already carry a Content-Encoding
+and server-sent events are passed through untouched.
+"""
+
+from starlette.datastructures import (
+    Headers,
+    MutableHeaders,
+)
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+
+    for token in accept_encoding.split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() != encoding:
+            continue
+
+        quality = params.strip().removeprefix("q=")
+        try:
+            return not params or float(quality) > 0
+        except ValueError:
+            return True
+
+    return False
+
+
+class CompressionMiddleware:
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        if scope["type"] == "http" and brotli is not None:
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            if accepts_encoding(accept_encoding, "br"):
+                responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+                await responder(scope, receive, send)
+                return
+
+        await self.gzip(scope, receive, send)
+
+
+class BrotliResponder:
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.quality = quality
+        self.send: Send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        self.send = send
+        await self.app(scope, receive, self.send_with_brotli)
+
+    async def send_with_brotli(self, message: Message) -> None:
+
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            await self._start()
+            await self.send(message)
+            return
+
+        if not self.started:
+            if not more_body and len(body) < self.minimum_size:
+                await self._start()
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = "br"
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = brotli.compress(body, quality=self.quality)
+                headers["Content-Length"] = str(len(compressed))
+                await self._start()
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming: the final length is unknown
+            del headers["Content-Length"]
+            self.compressor = brotli.Compressor(quality=self.quality)
+            await self._start()
+
+        chunk = self.compressor.process(body)
+        chunk += self.compressor.flush() if more_body else self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _start(self) -> None:
+
+        if not self.started:
+            self.started = True
+            await self.send(self.initial_message)
@@ -0,0 +1,186 @@
+"""
+Per-route request metrics in Prometheus text format.
+
+`MetricsMiddleware` records, per method and route template (e.g.
+`/api/v1/cart/{cart_id}/items`):
+
+- http_requests_total{method, route, status}
+- http_request_duration_seconds{method, route} (histogram)
+- http_business_errors_total{method, route, error}, by BusinessException subclass
+- http_requests_in_flight
+
+Every update happens on the event loop thread (the middleware never runs in
+the threadpool), so the counters are plain integers with no locking. Series
+for every declared route are allocated on the first request; anything that
+matches no route is folded into `route="<unmatched>"` to bound cardinality.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Iterable
+
+from starlette.routing import BaseRoute
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+# Key under which the BusinessException handler leaves the error name in the ASGI scope
+BUSINESS_ERROR_SCOPE_KEY = "app.business_error"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+
+        self.buckets = buckets
+        # One slot per bucket plus +Inf, non-cumulative; render() accumulates
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+
+        self.buckets = tuple(sorted(buckets))
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.durations: dict[tuple[str, str], Histogram] = {}
+        self.business_errors: dict[tuple[str, str, str], int] = {}
+        self.allocated = False
+
+    def allocate(self, routes: Iterable[BaseRoute]) -> None:
+
+        for route in routes:
+            path = getattr(route, "path", None)
+            for method in getattr(route, "methods", None) or ():
+                if path is not None:
+                    self.durations.setdefault((method, path), Histogram(self.buckets))
+
+        self.allocated = True
+
+    def observe(self, method: str, route: str, status: int, seconds: float, error: str | None) -> None:
+
+        histogram = self.durations.get((method, route))
+        if histogram is None:
+            histogram = self.durations[(method, route)] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        if error is not None:
+            error_key = (method, route, error)
+            self.business_errors[error_key] = self.business_errors.get(error_key, 0) + 1
+
+    def render(self) -> str:
+
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests served, by route template and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {value}")
+
+        lines += [
+            "# HELP http_business_errors_total Requests answered from a BusinessException, by subclass.",
+            "# TYPE http_business_errors_total counter",
+        ]
+        for (method, route, error), value in sorted(self.business_errors.items()):
+            lines.append(f"http_business_errors_total{_labels(method=method, route=route, error=error)} {value}")
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from request start to the end of the response body.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.durations.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(
+                    f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}"
+                )
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{labels} {histogram.sum}")
+            lines.append(f"http_request_duration_seconds_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def mark_business_error(scope: Scope, error: Exception) -> None:
+
+    scope[BUSINESS_ERROR_SCOPE_KEY] = error.__class__.__name__
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        if not metrics.allocated and "app" in scope:
+            metrics.allocate(scope["app"].routes)
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            # The router stores the matched route in the scope; its path is the template
+            route = scope.get("route")
+            metrics.observe(
+                method=scope["method"],
+                route=getattr(route, "path", UNMATCHED_ROUTE),
+                status=status,
+                seconds=time.perf_counter() - started,
+                error=scope.get(BUSINESS_ERROR_SCOPE_KEY),
+            )
+
+
+def _labels(**labels) -> str:
+
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
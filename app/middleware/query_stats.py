@@ -0,0 +1,102 @@
+"""
+Database cost per request: Server-Timing header, access log and query budget.
+
+For every HTTP request `QueryStatsMiddleware` activates a fresh QueryStats
+(see app.db.query_stats) and then:
+
+- adds `Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>` to the
+  response, as measured when the response starts
+- writes one JSON line per request to the `app.access` logger, with the
+  final counts (streamed bodies included)
+- warns on `app.db.query_budget` when a request runs more than `budget`
+  statements
+"""
+
+import json
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from app.db.query_stats import (
+    QueryStats,
+    current_query_stats,
+)
+from app.middleware.metrics import BUSINESS_ERROR_SCOPE_KEY
+
+access_logger = logging.getLogger("app.access")
+budget_logger = logging.getLogger("app.db.query_budget")
+
+
+class QueryStatsMiddleware:
+
+    def __init__(self, app: ASGIApp, budget: int | None = None, access_log: bool = True):
+
+        self.app = app
+        self.budget = budget
+        self.access_log = access_log
+
+        if access_log and not access_logger.handlers:
+            access_logger.addHandler(logging.StreamHandler())
+            access_logger.setLevel(logging.INFO)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, status, stats, time.perf_counter() - started)
+
+    def _report(self, scope: Scope, status: int, stats: QueryStats, elapsed: float) -> None:
+
+        route = getattr(scope.get("route"), "path", None)
+        if self.budget is not None and stats.count > self.budget:
+            budget_logger.warning(
+                "%s %s ran %d queries (budget %d)",
+                scope["method"], route or scope["path"], stats.count, self.budget,
+            )
+
+        if self.access_log:
+            access_logger.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route,
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 3),
+                "db_queries": stats.count,
+                "db_ms": round(stats.duration * 1000, 3),
+                "error": scope.get(BUSINESS_ERROR_SCOPE_KEY),
+            }))
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+
+    return (
+        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
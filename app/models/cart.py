@@ -1,5 +1,6 @@
 from typing import List
 from enum import Enum
+from decimal import Decimal
 from datetime import (
     datetime,
     timezone
@@ -10,6 +11,7 @@ from sqlalchemy import (
     ForeignKey,
     Enum as SQLEnum,
     DateTime,
+    Numeric,
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -24,6 +26,8 @@ class CartStatus(Enum):
     OPEN: str = "open"
     CHECKOUT: str = "checkout"
     PAID: str = "paid"
+    # Set by the maintenance sweeper on carts left OPEN longer than CART_OPEN_TTL_HOURS
+    EXPIRED: str = "expired"
 
 
 class Cart(Base):
@@ -34,4 +38,10 @@ class Cart(Base):
     client_id: Mapped[int] = mapped_column(ForeignKey("customers.id"), index=True)
     status: Mapped[CartStatus] = mapped_column(SQLEnum(CartStatus), index=True, default=CartStatus.OPEN)
     created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: datetime.now(timezone.utc))
-    items: Mapped[List["CartItem"]] = relationship("CartItem", back_populates="cart", cascade="all, delete-orphan")
\ No newline at end of file
+    # Denormalized totals kept in sync by CartService: Σ(quantity × unit_price_snapshot) and Σ(quantity)
+    subtotal: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, default=Decimal("0.00"), server_default="0")
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    items: Mapped[List["CartItem"]] = relationship("CartItem", back_populates="cart", cascade="all, delete-orphan")
+
+    # Ids are never reused (SQLite would otherwise hand out archived ids again)
+    __table_args__ = {"sqlite_autoincrement": True}
\ No newline at end of file
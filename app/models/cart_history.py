@@ -0,0 +1,35 @@
+from typing import List
+from decimal import Decimal
+from datetime import datetime
+
+from sqlalchemy import (
+    Integer,
+    Enum as SQLEnum,
+    DateTime,
+    Numeric,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+    relationship,
+)
+
+from app.db.base import Base
+from app.models.cart import CartStatus
+
+
+# PAID carts moved out of `carts` by the archival job (app.sweeper), keeping their ids
+class CartHistory(Base):
+
+    __tablename__ = "carts_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    # No foreign keys to the hot tables: archived rows must not hold them back
+    client_id: Mapped[int] = mapped_column(Integer, index=True)
+    status: Mapped[CartStatus] = mapped_column(SQLEnum(CartStatus))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    subtotal: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    items: Mapped[List["CartItemHistory"]] = relationship("CartItemHistory", order_by="CartItemHistory.id")
+    payments: Mapped[List["PaymentHistory"]] = relationship("PaymentHistory", order_by="PaymentHistory.id")
@@ -28,4 +28,5 @@ class CartItem(Base):
 
     __table_args__ = (
         UniqueConstraint("cart_id", "offer_id", name="uq_cart_offer"),
+        {"sqlite_autoincrement": True},
     )
\ No newline at end of file
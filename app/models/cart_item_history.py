@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    Integer,
+    ForeignKey,
+    Numeric,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db.base import Base
+
+
+class CartItemHistory(Base):
+
+    __tablename__ = "cart_items_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    cart_id: Mapped[int] = mapped_column(ForeignKey("carts_history.id"), index=True)
+    # Offers may be deleted by the sweeper once no live cart item references them
+    offer_id: Mapped[int] = mapped_column(Integer)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    unit_price_snapshot: Mapped[Decimal] = mapped_column(Numeric(10, 2))
@@ -0,0 +1,29 @@
+from datetime import (
+    datetime,
+    timezone
+)
+
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    DateTime,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # "<METHOD> <path>" of the request that first used the key
+    scope: Mapped[str] = mapped_column(String(300), nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
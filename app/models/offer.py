@@ -10,6 +10,7 @@ from sqlalchemy import (
     ForeignKey,
     Numeric,
     Date,
+    Index,
     UniqueConstraint,
 )
 
@@ -28,4 +29,6 @@ class Offer(Base):
 
     __table_args__ = (
         UniqueConstraint("product_id", "client_id", name="uq_product_client"),
+        # Serves the per-client offer listing, which filters on validity
+        Index("ix_offers_client_id_valid_until", "client_id", "valid_until"),
     )
\ No newline at end of file
@@ -32,4 +32,6 @@ class Payment(Base):
     cart_id: Mapped[int] = mapped_column(ForeignKey("carts.id"))
     status: Mapped[PaymentStatus] = mapped_column(SQLEnum(PaymentStatus))
     amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), default=Decimal(0.00))
-    created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,28 @@
+from decimal import Decimal
+from datetime import datetime
+
+from sqlalchemy import (
+    Integer,
+    ForeignKey,
+    Enum as SQLEnum,
+    DateTime,
+    Numeric,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db.base import Base
+from app.models.payment import PaymentStatus
+
+
+class PaymentHistory(Base):
+
+    __tablename__ = "payments_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    cart_id: Mapped[int] = mapped_column(ForeignKey("carts_history.id"), index=True)
+    status: Mapped[PaymentStatus] = mapped_column(SQLEnum(PaymentStatus))
+    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
@@ -0,0 +1,27 @@
+from datetime import (
+    datetime,
+    timezone
+)
+
+from sqlalchemy import (
+    Integer,
+    String,
+    DateTime,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db.base import Base
+
+
+class SchemaVersion(Base):
+
+    __tablename__ = "schema_version"
+
+    # Single row (id = 1)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Fingerprint of the metadata the database was last created from (see app.db.schema)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,26 @@
+from datetime import (
+    datetime,
+    timezone
+)
+
+from sqlalchemy import (
+    Integer,
+    String,
+    DateTime,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+from app.db.base import Base
+
+
+class TableVersion(Base):
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Incremented by every committed transaction that writes to the table
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
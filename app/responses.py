@@ -0,0 +1,40 @@
+"""
+Fast JSON response class used as the application's default.
+
+Serializes with orjson when it is installed, which handles `date`,
+`datetime` and enums natively; `Decimal` is written as a string, the same
+representation Pydantic uses in JSON mode. Without orjson it falls back to
+Starlette's `JSONResponse`.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+
+    if isinstance(value, Decimal):
+        return str(value)
+
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+
+    def render(self, content: Any) -> bytes:
+
+        if orjson is None:
+            return super().render(content)
+
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
@@ -0,0 +1,59 @@
+from fastapi import (
+    APIRouter,
+    Query,
+    status,
+)
+
+from app.db.connection import get_pools_status
+from app.db.slow_queries import slow_query_log
+from app.startup import startup_report
+from app.sweeper import sweeper
+from app.services.catalog_service.catalog_cache import (
+    catalog_cache,
+    invalidate_catalog_cache,
+)
+
+
+admin_router = APIRouter(prefix="/admin")
+
+@admin_router.get("/pool")
+def pool_status():
+
+    return get_pools_status()
+
+
+@admin_router.get("/cache")
+def cache_stats():
+
+    return {"catalog": catalog_cache.stats()}
+
+
+@admin_router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+def invalidate_cache():
+
+    invalidate_catalog_cache()
+
+
+@admin_router.get("/slow-queries")
+def slow_queries(limit: int = Query(50, ge=1, le=1000, description="Most recent entries to return")):
+
+    return {"entries": slow_query_log.recent(limit=limit)}
+
+
+@admin_router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries():
+
+    slow_query_log.clear()
+
+
+@admin_router.get("/startup")
+def startup_timing():
+
+    return startup_report.as_dict()
+
+
+@admin_router.get("/sweeper")
+async def sweeper_status():
+
+    # async: read on the event loop, where the sweeper updates its counters
+    return sweeper.status()
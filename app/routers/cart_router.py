@@ -5,32 +5,48 @@ from fastapi import (
 )
 
 from app.dependencies.cart_dependencies import get_cart_service
-from app.services.cart_service.CartService import CartService
-from app.schemas.cart_schema import CartSchema
-from app.schemas.offers_schema import AddOfferToCart
+from app.services.cart_service.AsyncCartService import AsyncCartService
+from app.schemas.cart_schema import (
+    CartSchema,
+    BulkAddOffersResponseSchema,
+)
+from app.schemas.offers_schema import (
+    AddOfferToCart,
+    BulkAddOffersToCart,
+)
 
 
 cart_router = APIRouter(prefix="/cart")
 
 @cart_router.post("/create-cart/{client_id}", status_code=status.HTTP_201_CREATED, response_model=CartSchema)
-def create_cart(client_id: int, service: CartService = Depends(get_cart_service)):
+async def create_cart(client_id: int, service: AsyncCartService = Depends(get_cart_service)):
 
-    return service.create_cart(client_id=client_id)
+    return await service.create_cart(client_id=client_id)
 
     
 @cart_router.post("/{cart_id}/items", response_model=CartSchema)
-def add_offer(cart_id: int, offer: AddOfferToCart, service: CartService = Depends(get_cart_service)):
+async def add_offer(cart_id: int, offer: AddOfferToCart, service: AsyncCartService = Depends(get_cart_service)):
     
-    return service.add_offer_to_cart(
+    return await service.add_offer_to_cart(
         cart_id=cart_id,
         offer_to_be_added=offer,
     )
 
 
+@cart_router.post("/{cart_id}/items/bulk", response_model=BulkAddOffersResponseSchema)
+async def add_offers(cart_id: int, offers: BulkAddOffersToCart, service: AsyncCartService = Depends(get_cart_service)):
+
+    cart, results = await service.add_offers_to_cart(
+        cart_id=cart_id,
+        offers_to_be_added=offers.items,
+    )
+    return {"cart": cart, "results": results}
+
+
 @cart_router.delete("/{cart_id}/items/{cart_item_id}", response_model=CartSchema)
-def remove_offer(cart_id: int, cart_item_id: int, service: CartService = Depends(get_cart_service)):
+async def remove_offer(cart_id: int, cart_item_id: int, service: AsyncCartService = Depends(get_cart_service)):
 
-    return service.remove_offer_from_cart(
+    return await service.remove_offer_from_cart(
         cart_id=cart_id,
         cart_item_id=cart_item_id
     )
\ No newline at end of file
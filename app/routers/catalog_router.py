@@ -1,10 +1,19 @@
-from typing import List
 from fastapi import (
     APIRouter,
-    Depends
+    Depends,
+    Header,
+    Query,
+    Response,
+    status,
 )
 
-from app.services.catalog_service.CatalogService import CatalogService
+from app.services.catalog_service.AsyncCatalogService import AsyncCatalogService
+from app.services.catalog_service.catalog_cache import CatalogBody
+from app.schemas.pagination_schema import (
+    Page,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
 from app.schemas.products_schema import ProductSchema
 from app.schemas.clients_schema import CustomerSchema
 from app.schemas.offers_schema import OfferSchema
@@ -13,19 +22,62 @@ from app.dependencies.catalog_dependencies import get_catalog_service
 
 catalog_router = APIRouter(prefix="/catalog")
 
-@catalog_router.get("/products", response_model=List[ProductSchema])
-def get_products(service: CatalogService = Depends(get_catalog_service)):
+PageLimit = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items in the page")
+PageAfter = Query(None, ge=0, description="Cursor returned as `next_cursor` by the previous page")
+IfNoneMatch = Header(None, description="ETag of a previously received page; answered with 304 if unchanged")
+
+@catalog_router.get("/products", response_model=Page[ProductSchema])
+async def get_products(
+    limit: int = PageLimit,
+    after: int | None = PageAfter,
+    if_none_match: str | None = IfNoneMatch,
+    service: AsyncCatalogService = Depends(get_catalog_service),
+):
 
-    return service.list_products()
+    return _conditional_response(
+        await service.list_products_json(limit=limit, after=after, if_none_match=if_none_match)
+    )
 
 
-@catalog_router.get("/customers", response_model=List[CustomerSchema])
-def get_customers(service: CatalogService = Depends(get_catalog_service)):
+@catalog_router.get("/customers", response_model=Page[CustomerSchema])
+async def get_customers(
+    limit: int = PageLimit,
+    after: int | None = PageAfter,
+    if_none_match: str | None = IfNoneMatch,
+    service: AsyncCatalogService = Depends(get_catalog_service),
+):
     
-    return service.list_customers()
+    return _conditional_response(
+        await service.list_customers_json(limit=limit, after=after, if_none_match=if_none_match)
+    )
 
 
-@catalog_router.get("/client/offers/{client_id}", response_model=List[OfferSchema])
-def collect_customer_offers(client_id: int, service: CatalogService = Depends(get_catalog_service)):
+@catalog_router.get("/client/offers/{client_id}", response_model=Page[OfferSchema])
+async def collect_customer_offers(
+    client_id: int,
+    limit: int = PageLimit,
+    after: int | None = PageAfter,
+    include_expired: bool = Query(False, description="Also return offers past their valid_until date"),
+    if_none_match: str | None = IfNoneMatch,
+    service: AsyncCatalogService = Depends(get_catalog_service),
+):
     
-    return service.list_customer_offers(client_id=client_id)
\ No newline at end of file
+    return _conditional_response(
+        await service.list_customer_offers_json(
+            client_id=client_id,
+            limit=limit,
+            after=after,
+            include_expired=include_expired,
+            if_none_match=if_none_match,
+        )
+    )
+
+
+def _conditional_response(result: CatalogBody) -> Response:
+
+    # no-cache: clients may store the page but must revalidate it with If-None-Match
+    headers = {"ETag": result.etag, "Cache-Control": "no-cache"}
+    if result.body is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=result.body, media_type="application/json", headers=headers)
\ No newline at end of file
@@ -1,24 +1,100 @@
+from typing import (
+    Awaitable,
+    Callable,
+)
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
+    Request,
+    Response,
 )
+from pydantic import BaseModel
 
-from app.services.checkout_service.CheckoutService import CheckoutService
+from app.services.checkout_service.AsyncCheckoutService import AsyncCheckoutService
+from app.services.idempotency_service.AsyncIdempotencyService import AsyncIdempotencyService
 from app.schemas.cart_schema import CartSchema
-from app.schemas.payment_schema import PaymentResponseSchema
+from app.schemas.payment_schema import (
+    PaymentResponseSchema,
+    PaymentBatchRequest,
+    PaymentBatchResponseSchema,
+)
 from app.dependencies.checkout_dependencies import get_checkout_service
+from app.dependencies.idempotency_dependencies import get_idempotency_service
 
 
 checkout_router = APIRouter(prefix="/checkout")
 
+IdempotencyKeyHeader = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Retries sent with the same key are answered with the stored response",
+)
+
 @checkout_router.post("/{cart_id}", response_model=CartSchema)
-def checkout(cart_id: int, service: CheckoutService = Depends(get_checkout_service)):
+async def checkout(
+    cart_id: int,
+    request: Request,
+    idempotency_key: str | None = IdempotencyKeyHeader,
+    service: AsyncCheckoutService = Depends(get_checkout_service),
+    idempotency: AsyncIdempotencyService = Depends(get_idempotency_service),
+):
 
-    return service.start_checkout(cart_id=cart_id)
+    async def start_checkout() -> CartSchema:
+        cart = await service.start_checkout(cart_id=cart_id)
+        return CartSchema.model_validate(cart)
+
+    return await _idempotent(request, idempotency_key, idempotency, start_checkout)
 
 
 @checkout_router.post("/payment/{cart_id}", response_model=PaymentResponseSchema)
-def payment(cart_id: int, service: CheckoutService = Depends(get_checkout_service)):
+async def payment(
+    cart_id: int,
+    request: Request,
+    idempotency_key: str | None = IdempotencyKeyHeader,
+    service: AsyncCheckoutService = Depends(get_checkout_service),
+    idempotency: AsyncIdempotencyService = Depends(get_idempotency_service),
+):
+
+    async def finalize_payment() -> PaymentResponseSchema:
+        cart, payment = await service.finalize_payment(cart_id=cart_id)
+        return PaymentResponseSchema.model_validate(
+            {"cart": cart, "payment": payment},
+            from_attributes=True,
+        )
+
+    return await _idempotent(request, idempotency_key, idempotency, finalize_payment)
+
+
+@checkout_router.post("/payments/batch", response_model=PaymentBatchResponseSchema)
+async def batch_payment(batch: PaymentBatchRequest, service: AsyncCheckoutService = Depends(get_checkout_service)):
+
+    results = await service.finalize_payments(cart_ids=batch.cart_ids)
+    return {"results": results}
+
+
+async def _idempotent(
+    request: Request,
+    idempotency_key: str | None,
+    idempotency: AsyncIdempotencyService,
+    handler: Callable[[], Awaitable[BaseModel]],
+):
+
+    if idempotency_key is None:
+        return await handler()
+
+    scope = f"{request.method} {request.url.path}"
+    stored = await idempotency.lookup(key=idempotency_key, scope=scope)
+    if stored is not None:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    body = (await handler()).model_dump_json().encode()
+    await idempotency.save(key=idempotency_key, scope=scope, status_code=200, body=body)
 
-    cart, payment = service.finalize_payment(cart_id=cart_id)
-    return {"cart": cart, "payment": payment}
\ No newline at end of file
+    return Response(content=body, media_type="application/json")
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import (
+    AsyncIterator,
+    Iterator,
+)
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+)
+from fastapi.responses import StreamingResponse
+
+from app.models.cart import CartStatus
+from app.services.export_service.ExportService import ExportService
+from app.dependencies.export_dependencies import get_export_service
+
+
+export_router = APIRouter(prefix="/export")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Since = Query(None, description="Only rows created at or after this instant (UTC when no offset is given)")
+Until = Query(None, description="Only rows created before this instant (UTC when no offset is given)")
+
+@export_router.get("/offers")
+async def export_offers(
+    client_id: int | None = Query(None, description="Only offers of this client"),
+    include_expired: bool = Query(False, description="Also export offers past their valid_until date"),
+    service: ExportService = Depends(get_export_service),
+):
+
+    return _ndjson_response(
+        service.export_offers(client_id=client_id, include_expired=include_expired),
+        filename="offers",
+    )
+
+
+@export_router.get("/carts")
+async def export_carts(
+    since: datetime | None = Since,
+    until: datetime | None = Until,
+    status: CartStatus | None = Query(None, description="Only carts in this state"),
+    service: ExportService = Depends(get_export_service),
+):
+
+    return _ndjson_response(
+        service.export_carts(since=since, until=until, status=status),
+        filename="carts",
+    )
+
+
+@export_router.get("/payments")
+async def export_payments(
+    since: datetime | None = Since,
+    until: datetime | None = Until,
+    service: ExportService = Depends(get_export_service),
+):
+
+    return _ndjson_response(
+        service.export_payments(since=since, until=until),
+        filename="payments",
+    )
+
+
+def _ndjson_response(chunks: Iterator[bytes] | AsyncIterator[bytes], filename: str) -> StreamingResponse:
+
+    return StreamingResponse(
+        chunks,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
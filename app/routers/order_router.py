@@ -0,0 +1,17 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+)
+
+from app.services.order_service.AsyncOrderService import AsyncOrderService
+from app.schemas.order_schema import OrderSchema
+from app.dependencies.order_dependencies import get_order_service
+
+
+order_router = APIRouter(prefix="/orders")
+
+@order_router.get("/{cart_id}", response_model=OrderSchema)
+async def get_order(cart_id: int, service: AsyncOrderService = Depends(get_order_service)):
+
+    order = await service.get_order(cart_id=cart_id)
+    return OrderSchema.model_validate(order._asdict(), from_attributes=True)
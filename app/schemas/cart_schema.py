@@ -1,16 +1,25 @@
 from typing import List
 from datetime import datetime
+from decimal import Decimal
 from pydantic import BaseModel
 
 from app.models.cart import CartStatus
 from app.schemas.cart_items_schema import CartItemSchema
+from app.schemas.offers_schema import AddOfferResult
 
 class CartSchema(BaseModel):
     id: int
     client_id: int
     status: CartStatus
     created_at: datetime
+    subtotal: Decimal = Decimal("0.00")
+    item_count: int = 0
     items: List[CartItemSchema] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BulkAddOffersResponseSchema(BaseModel):
+    cart: CartSchema
+    results: List[AddOfferResult]
\ No newline at end of file
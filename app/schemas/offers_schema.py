@@ -1,3 +1,4 @@
+from typing import List
 from datetime import date
 from decimal import Decimal
 from pydantic import (
@@ -20,3 +21,17 @@ class OfferSchema(BaseModel):
 class AddOfferToCart(BaseModel):
     offer_id: int
     quantity: int = Field(gt=0, description="Quantity must be greater than zero")
+
+
+class BulkAddOffersToCart(BaseModel):
+    items: List[AddOfferToCart] = Field(min_length=1, max_length=500)
+
+
+class AddOfferResult(BaseModel):
+    """Outcome of one line of a bulk add; `error`/`detail` mirror the BusinessException raised for it"""
+    index: int
+    offer_id: int
+    quantity: int
+    added: bool
+    error: str | None = None
+    detail: str | None = None
\ No newline at end of file
@@ -0,0 +1,11 @@
+from typing import List
+from pydantic import BaseModel
+
+from app.schemas.cart_schema import CartSchema
+from app.schemas.payment_schema import PaymentSchema
+
+class OrderSchema(BaseModel):
+    cart: CartSchema
+    payments: List[PaymentSchema]
+    # True when the order was served from the history tables
+    archived: bool
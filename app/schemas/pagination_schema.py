@@ -0,0 +1,22 @@
+from typing import (
+    Generic,
+    List,
+    TypeVar,
+)
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    One page of a keyset-paginated listing.
+
+    `next_cursor` is the primary key of the last item on the page; pass it back
+    as `after` to fetch the next page. It is null on the last page.
+    """
+    items: List[T]
+    next_cursor: int | None = None
\ No newline at end of file
@@ -1,6 +1,10 @@
+from typing import List
 from datetime import datetime
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    Field,
+)
 
 from app.schemas.cart_schema import CartSchema
 from app.models.payment import PaymentStatus
@@ -17,4 +21,19 @@ class PaymentSchema(BaseModel):
 
 class PaymentResponseSchema(BaseModel):
     cart: CartSchema
-    payment: PaymentSchema
\ No newline at end of file
+    payment: PaymentSchema
+
+class PaymentBatchRequest(BaseModel):
+    cart_ids: List[int] = Field(min_length=1, max_length=5000)
+
+class PaymentBatchResult(BaseModel):
+    """Settlement outcome of one cart; `error`/`detail` mirror the BusinessException that prevented it"""
+    cart_id: int
+    paid: bool
+    payment_id: int | None = None
+    amount: Decimal | None = None
+    error: str | None = None
+    detail: str | None = None
+
+class PaymentBatchResponseSchema(BaseModel):
+    results: List[PaymentBatchResult]
\ No newline at end of file
@@ -0,0 +1,89 @@
+import logging
+from typing import (
+    List,
+    Tuple,
+)
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import run_in_session
+from app.schemas.offers_schema import (
+    AddOfferToCart,
+    AddOfferResult,
+)
+from app.models.cart import Cart
+from app.services.cart_service.CartService import CartService
+
+logger = logging.getLogger("app.db.lazy_load")
+
+
+class AsyncCartService:
+
+    """
+    Awaitable variant of CartService.
+
+    Business rules live in CartService; each call runs it against the request
+    session via `run_in_session`, so it works on top of an AsyncSession
+    (DATA_BASE_ASYNC) as well as a regular Session.
+    """
+
+    def __init__(self, session: AsyncSession | Session):
+
+        self.session = session
+
+    async def create_cart(self, client_id: int) -> Cart:
+
+        return await run_in_session(
+            self.session,
+            lambda session: CartService(session=session).create_cart(client_id=client_id),
+        )
+
+    async def add_offer_to_cart(self, cart_id: int, offer_to_be_added: AddOfferToCart) -> Cart:
+
+        return await run_in_session(
+            self.session,
+            lambda session: check_cart_items_loaded(
+                CartService(session=session).add_offer_to_cart(
+                    cart_id=cart_id,
+                    offer_to_be_added=offer_to_be_added,
+                )
+            ),
+        )
+
+    async def add_offers_to_cart(
+        self,
+        cart_id: int,
+        offers_to_be_added: List[AddOfferToCart],
+    ) -> Tuple[Cart, List[AddOfferResult]]:
+
+        def add_offers(session: Session) -> Tuple[Cart, List[AddOfferResult]]:
+            cart, results = CartService(session=session).add_offers_to_cart(
+                cart_id=cart_id,
+                offers_to_be_added=offers_to_be_added,
+            )
+            return check_cart_items_loaded(cart), results
+
+        return await run_in_session(self.session, add_offers)
+
+    async def remove_offer_from_cart(self, cart_id: int, cart_item_id: int) -> Cart:
+
+        return await run_in_session(
+            self.session,
+            lambda session: check_cart_items_loaded(
+                CartService(session=session).remove_offer_from_cart(
+                    cart_id=cart_id,
+                    cart_item_id=cart_item_id,
+                )
+            ),
+        )
+
+
+def check_cart_items_loaded(cart: Cart) -> Cart:
+
+    # CartSchema serializes `items`, which the services load eagerly. A path that
+    # forgot to is reported, not fixed with a lazy load that would hide the N+1
+    if "items" in inspect(cart).unloaded:
+        logger.warning("Cart %s returned without its items loaded; load them eagerly in the service", cart.id)
+    return cart
@@ -1,10 +1,24 @@
 from datetime import date
-from typing import Tuple
+from decimal import Decimal
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
 
-from sqlalchemy.orm import Session
-from sqlalchemy import select, or_
+from sqlalchemy.orm import (
+    Session,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import select, update, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 
-from app.schemas.offers_schema import AddOfferToCart
+from app.schemas.offers_schema import (
+    AddOfferToCart,
+    AddOfferResult,
+)
 from app.models.offer import Offer
 from app.models.cart_item import CartItem
 from app.models.cart import (
@@ -12,6 +26,7 @@ from app.models.cart import (
     CartStatus,
 )
 from app.exceptions import (
+    BusinessException,
     CartAlreadyExistsError, 
     OfferDoesNotBelongToClientError,
     CartNotFoundError,
@@ -22,6 +37,12 @@ from app.exceptions import (
     InvalidCartStateError,
 )
 
+# Dialect-specific INSERT constructs that support ON CONFLICT ... DO UPDATE
+UPSERT_INSERTS = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
 class CartService:
 
     """
@@ -31,7 +52,8 @@ class CartService:
     - Ensure a client has only one open cart
     - Validate cart state before modifications
     - Validate offer ownership and expiration
-    - Handle cart item creation and removal
+    - Handle cart item creation and removal, one at a time or in bulk
+    - Keep the cart's denormalized subtotal and item_count in sync with its items
     """
 
     def __init__(self, session: Session):
@@ -43,7 +65,8 @@ class CartService:
         if self._check_existing_cart_in_progress(client_id=client_id):
             raise CartAlreadyExistsError()
         
-        new_cart = Cart(client_id=client_id)
+        # A new cart has no items: initializing the collection avoids a lazy load on serialization
+        new_cart = Cart(client_id=client_id, items=[])
         self.session.add(new_cart)
         self.session.flush()
 
@@ -60,27 +83,77 @@ class CartService:
             offer_id=offer_to_be_added.offer_id,
         )
 
-        existing_cart_item = self._check_existing_cart_item(
-            cart_id=cart.id,
-            offer_id=offer.id
+        self._increment_cart_items(
+            cart=cart,
+            lines={offer.id: (offer_to_be_added.quantity, offer.unit_price)},
         )
-        if existing_cart_item:
 
-            existing_cart_item.quantity += offer_to_be_added.quantity
-            return existing_cart_item.cart
-        
-        cart_item = CartItem(
-            cart_id=cart.id,
-            offer_id=offer.id,
-            quantity=offer_to_be_added.quantity,
-            unit_price_snapshot=offer.unit_price,
+        return cart
+    
+    def add_offers_to_cart(
+        self,
+        cart_id: int,
+        offers_to_be_added: List[AddOfferToCart],
+    ) -> Tuple[Cart, List[AddOfferResult]]:
+
+        """
+        Adds many offers to a cart in a single round-trip.
+
+        The cart is validated once and all referenced offers are fetched with one
+        IN query; the valid lines are then written by a single upsert. A line that
+        breaks a business rule is reported in its result instead of aborting the batch.
+        """
+
+        cart = self.validate_cart(
+            cart_id=cart_id,
+            require_open=True,
         )
 
-        self.session.add(cart_item)
-        self.session.flush()
-        
-        return cart_item.cart
-    
+        offer_ids = {line.offer_id for line in offers_to_be_added}
+        offers = {
+            offer.id: offer
+            for offer in self.session.scalars(select(Offer).where(Offer.id.in_(offer_ids)))
+        }
+
+        results = []
+        lines: Dict[int, Tuple[int, Decimal]] = {}
+        for index, line in enumerate(offers_to_be_added):
+
+            try:
+                offer = self._check_offer(offer=offers.get(line.offer_id), offer_id=line.offer_id)
+                if cart.client_id != offer.client_id:
+                    raise OfferDoesNotBelongToClientError()
+            except BusinessException as exc:
+                results.append(
+                    AddOfferResult(
+                        index=index,
+                        offer_id=line.offer_id,
+                        quantity=line.quantity,
+                        added=False,
+                        error=exc.__class__.__name__,
+                        detail=exc.detail,
+                    )
+                )
+                continue
+
+            # Repeated offers are merged, an upsert cannot touch the same row twice
+            quantity, _ = lines.get(offer.id, (0, offer.unit_price))
+            lines[offer.id] = (quantity + line.quantity, offer.unit_price)
+
+            results.append(
+                AddOfferResult(
+                    index=index,
+                    offer_id=line.offer_id,
+                    quantity=line.quantity,
+                    added=True,
+                )
+            )
+
+        if lines:
+            self._increment_cart_items(cart=cart, lines=lines)
+
+        return cart, results
+
     def remove_offer_from_cart(self, cart_id: int, cart_item_id: int) -> Cart:
 
         """
@@ -97,9 +170,16 @@ class CartService:
             cart_item_id=cart_item_id
         )
 
-        self.session.delete(cart_item)
+        # delete-orphan cascade deletes the row and keeps the loaded collection in sync
+        cart.items.remove(cart_item)
         self.session.flush()
 
+        self._adjust_cart_totals(
+            cart=cart,
+            amount=-(cart_item.quantity * cart_item.unit_price_snapshot),
+            quantity=-cart_item.quantity,
+        )
+
         return cart
 
     def _validate_cart_and_cart_item(self, cart_id: int, cart_item_id: int) -> Tuple[Cart, CartItem]:
@@ -107,7 +187,9 @@ class CartService:
         cart = self.validate_cart(
             cart_id=cart_id,
             require_open=True,
+            load_items=True,
         )
+        # Items of this cart are already in the identity map, so this is usually query-free
         cart_item = self._validate_cart_item(cart_item_id=cart_item_id)
 
         if cart.id != cart_item.cart_id:
@@ -130,9 +212,14 @@ class CartService:
             
             return cart, offer
     
-    def validate_cart(self, cart_id: int, require_open: bool = False) -> Cart:
+    def validate_cart(self, cart_id: int, require_open: bool = False, load_items: bool = False) -> Cart:
 
-        cart = self.session.get(Cart, cart_id)
+        # load_items fetches Cart.items up front (one extra SELECT ... IN) instead of lazily on access
+        cart = self.session.get(
+            Cart,
+            cart_id,
+            options=[selectinload(Cart.items)] if load_items else None,
+        )
         if not cart:
             raise CartNotFoundError(f"Cart with id {cart_id} not found.")
         
@@ -143,7 +230,13 @@ class CartService:
     
     def _validate_offer(self, offer_id: int) -> Offer:
 
-        offer = self.session.get(Offer, offer_id)
+        return self._check_offer(
+            offer=self.session.get(Offer, offer_id),
+            offer_id=offer_id,
+        )
+
+    def _check_offer(self, offer: Offer | None, offer_id: int) -> Offer:
+
         if not offer:
             raise OfferNotFoundError(f"Offer with id {offer_id} not found.")
         
@@ -160,17 +253,121 @@ class CartService:
         
         return cart_item
     
-    def _check_existing_cart_item(self, cart_id: int, offer_id: int):
-        
-        query = (
-            select(CartItem)
-            .where(
-                CartItem.cart_id == cart_id,
-                CartItem.offer_id == offer_id
+    def _increment_cart_items(self, cart: Cart, lines: Dict[int, Tuple[int, Decimal]]) -> None:
+
+        """
+        Adds `quantity` of each offer to the cart, creating the missing cart items.
+
+        `lines` maps offer_id -> (quantity, unit_price). On SQLite and PostgreSQL
+        this is one INSERT ... ON CONFLICT (cart_id, offer_id) DO UPDATE, so the
+        increment is atomic under concurrent adds and needs no prior SELECT.
+        Existing items keep their original unit_price_snapshot. The cart's
+        subtotal and item_count are updated in the same transaction.
+        """
+
+        insert = UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if insert is None:
+            self._increment_cart_items_orm(cart=cart, lines=lines)
+            return
+
+        statement = insert(CartItem).values([
+            {
+                "cart_id": cart.id,
+                "offer_id": offer_id,
+                "quantity": quantity,
+                "unit_price_snapshot": unit_price,
+            }
+            for offer_id, (quantity, unit_price) in lines.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[CartItem.cart_id, CartItem.offer_id],
+            set_={"quantity": CartItem.quantity + statement.excluded.quantity},
+        ).returning(CartItem.offer_id, CartItem.unit_price_snapshot)
+
+        # Existing items keep their snapshot, so the subtotal delta uses the price actually stored
+        snapshots = dict(self.session.execute(statement).tuples().all())
+        self._adjust_cart_totals(
+            cart=cart,
+            amount=sum(
+                (quantity * snapshots[offer_id] for offer_id, (quantity, _) in lines.items()),
+                Decimal("0.00"),
+            ),
+            quantity=sum(quantity for quantity, _ in lines.values()),
+        )
+
+        # The statement bypassed the unit of work, so the collection is read back explicitly
+        self._reload_cart_items(cart=cart)
+
+    def _increment_cart_items_orm(self, cart: Cart, lines: Dict[int, Tuple[int, Decimal]]) -> None:
+
+        # Fallback for dialects without ON CONFLICT support
+        self._reload_cart_items(cart=cart)
+        cart_items = {cart_item.offer_id: cart_item for cart_item in cart.items}
+        amount = Decimal("0.00")
+        for offer_id, (quantity, unit_price) in lines.items():
+
+            cart_item = cart_items.get(offer_id)
+            if cart_item:
+                cart_item.quantity += quantity
+                amount += quantity * cart_item.unit_price_snapshot
+                continue
+
+            cart.items.append(
+                CartItem(
+                    offer_id=offer_id,
+                    quantity=quantity,
+                    unit_price_snapshot=unit_price,
+                )
             )
+            amount += quantity * unit_price
+
+        self.session.flush()
+        self._adjust_cart_totals(
+            cart=cart,
+            amount=amount,
+            quantity=sum(quantity for quantity, _ in lines.values()),
         )
-        return self.session.scalars(query).first()
         
+    def _adjust_cart_totals(self, cart: Cart, amount: Decimal, quantity: int) -> None:
+
+        """
+        Applies a delta to the cart's subtotal and item_count.
+
+        The increment runs in SQL (`subtotal = subtotal + :amount`) within the
+        current transaction, so concurrent changes to the same cart are not lost.
+        """
+
+        statement = (
+            update(Cart)
+            .where(Cart.id == cart.id)
+            .values(
+                subtotal=Cart.subtotal + amount,
+                item_count=Cart.item_count + quantity,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        if not self.session.get_bind().dialect.update_returning:
+            self.session.execute(statement)
+            self.session.refresh(cart, ["subtotal", "item_count"])
+            return
+
+        subtotal, item_count = self.session.execute(
+            statement.returning(Cart.subtotal, Cart.item_count)
+        ).one()
+        set_committed_value(cart, "subtotal", subtotal)
+        set_committed_value(cart, "item_count", item_count)
+
+    def _reload_cart_items(self, cart: Cart) -> None:
+
+        cart_items = self.session.scalars(
+            select(CartItem)
+            .where(CartItem.cart_id == cart.id)
+            .order_by(CartItem.id)
+            .execution_options(populate_existing=True)
+        ).all()
+        set_committed_value(cart, "items", list(cart_items))
+
     def _check_existing_cart_in_progress(self, client_id: int):
 
         query = (
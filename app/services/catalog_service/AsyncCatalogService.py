@@ -0,0 +1,174 @@
+from datetime import date
+from typing import (
+    Callable,
+    Hashable,
+)
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import run_in_session
+from app.db.table_versions import get_table_versions
+from app.etag import (
+    make_etag,
+    etag_matches,
+)
+from app.schemas.pagination_schema import Page
+from app.services.catalog_service.CatalogService import CatalogService
+from app.services.catalog_service.catalog_records import (
+    ProductRecord,
+    CustomerRecord,
+    OfferRecord,
+)
+from app.services.catalog_service.catalog_cache import (
+    catalog_cache,
+    is_behind,
+    CatalogBody,
+)
+
+
+class PageEncoder:
+
+    """
+    Pre-built JSON serializer for `Page[record]`.
+
+    Records come from typed columns, so the page is assembled with
+    `model_construct` and handed straight to the serializer: no per-row
+    validation. The output matches the `Page[...Schema]` response models.
+    """
+
+    __slots__ = ("page_type", "adapter")
+
+    def __init__(self, record: type):
+
+        self.page_type = Page[record]
+        self.adapter = TypeAdapter(self.page_type)
+
+    def dump_json(self, items: list, next_cursor: int | None) -> bytes:
+
+        return self.adapter.dump_json(
+            self.page_type.model_construct(items=items, next_cursor=next_cursor)
+        )
+
+
+products_page_encoder = PageEncoder(ProductRecord)
+customers_page_encoder = PageEncoder(CustomerRecord)
+offers_page_encoder = PageEncoder(OfferRecord)
+
+
+class AsyncCatalogService:
+
+    """
+    Awaitable variant of CatalogService.
+
+    Queries are delegated to CatalogService through `run_in_session`, so the
+    same code serves both the async and the blocking database stacks.
+
+    Every listing is returned as a JSON body plus an ETag derived from the
+    `table_versions` counters of the tables it reads. When the caller's
+    If-None-Match matches, the rows are neither loaded nor serialized.
+    Product and customer pages are additionally kept in `catalog_cache`; a
+    cached page is only served while its ETag matches the current counters,
+    so writes made by other processes (seed CLI, other workers) are seen
+    without waiting for the TTL.
+    """
+
+    def __init__(self, session: AsyncSession | Session):
+
+        self.session = session
+
+    async def list_products_json(
+        self,
+        limit: int,
+        after: int | None = None,
+        if_none_match: str | None = None,
+    ) -> CatalogBody:
+
+        def load(session: Session) -> bytes:
+            items, next_cursor = CatalogService(session=session).list_products(limit=limit, after=after)
+            return products_page_encoder.dump_json(items, next_cursor)
+
+        return await self._conditional(
+            key=("products", limit, after),
+            tables=("products",),
+            load=load,
+            if_none_match=if_none_match,
+        )
+
+    async def list_customers_json(
+        self,
+        limit: int,
+        after: int | None = None,
+        if_none_match: str | None = None,
+    ) -> CatalogBody:
+
+        def load(session: Session) -> bytes:
+            items, next_cursor = CatalogService(session=session).list_customers(limit=limit, after=after)
+            return customers_page_encoder.dump_json(items, next_cursor)
+
+        return await self._conditional(
+            key=("customers", limit, after),
+            tables=("customers",),
+            load=load,
+            if_none_match=if_none_match,
+        )
+
+    async def list_customer_offers_json(
+        self,
+        client_id: int,
+        limit: int,
+        after: int | None = None,
+        include_expired: bool = False,
+        if_none_match: str | None = None,
+    ) -> CatalogBody:
+
+        def load(session: Session) -> bytes:
+            items, next_cursor = CatalogService(session=session).list_customer_offers(
+                client_id=client_id,
+                limit=limit,
+                after=after,
+                include_expired=include_expired,
+            )
+            return offers_page_encoder.dump_json(items, next_cursor)
+
+        # Valid offers change with the calendar too, hence today's date in the key
+        return await self._conditional(
+            key=("offers", client_id, limit, after, include_expired, date.today()),
+            tables=("offers",),
+            load=load,
+            if_none_match=if_none_match,
+            cache=False,
+        )
+
+    async def _conditional(
+        self,
+        key: Hashable,
+        tables: tuple[str, ...],
+        load: Callable[[Session], bytes],
+        if_none_match: str | None,
+        cache: bool = True,
+    ) -> CatalogBody:
+
+        def fetch(session: Session) -> tuple[CatalogBody, bool]:
+            # One primary-key read of table_versions, also on a cache hit
+            versions = get_table_versions(session, tables)
+            etag = make_etag(key, versions)
+            if etag_matches(if_none_match, etag):
+                return CatalogBody(etag=etag, body=None), False
+
+            cached = catalog_cache.get(key) if cache else None
+            if cached is not None and cached.etag == etag:
+                return cached, False
+
+            # A lagging replica's page is served, but must not replace a newer one in the cache
+            behind = is_behind({table: version for table, (version, _) in versions.items()})
+            return CatalogBody(etag=etag, body=load(session)), cache and not behind
+
+        generation = catalog_cache.generation
+        result, loaded = await run_in_session(self.session, fetch)
+        if loaded:
+            catalog_cache.set(key, result, generation=generation)
+
+        return result
+
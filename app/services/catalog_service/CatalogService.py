@@ -1,11 +1,31 @@
-from typing import List
+from datetime import date
+from typing import (
+    List,
+    Tuple,
+)
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    select,
+    Select,
+)
+from sqlalchemy.orm import (
+    Session,
+    InstrumentedAttribute,
+)
 
 from app.models.product import Product
 from app.models.client import Client
 from app.models.offer import Offer
+from app.services.catalog_service.catalog_records import (
+    ProductRecord,
+    CustomerRecord,
+    OfferRecord,
+    columns_for,
+)
+
+PRODUCT_COLUMNS = columns_for(ProductRecord, Product)
+CUSTOMER_COLUMNS = columns_for(CustomerRecord, Client)
+OFFER_COLUMNS = columns_for(OfferRecord, Offer)
 
 class CatalogService:
 
@@ -15,7 +35,15 @@ class CatalogService:
     Responsibilities:
     - List available products
     - List registered customers
-    - Retrieve offers available for a specific client
+    - Retrieve offers available for a specific client (only valid ones by default)
+
+    Listings use keyset pagination on the primary key: each call returns at
+    most `limit` rows with id greater than `after`, plus the cursor for the
+    next page (None when there is no next page).
+
+    Listings select only the columns of their record type and return
+    slotted records (see catalog_records) instead of ORM instances, so
+    nothing is added to the session's identity map.
 
     This service does not modify data and contains no business state transitions.
     """
@@ -24,20 +52,45 @@ class CatalogService:
 
         self.session = session
 
-    def list_products(self) -> List[Product]:
+    def list_products(self, limit: int, after: int | None = None) -> Tuple[List[ProductRecord], int | None]:
 
-        query = select(Product)
-        return self.session.scalars(query).all()
+        return self._paginate(select(*PRODUCT_COLUMNS), Product.id, ProductRecord, limit=limit, after=after)
     
-    def list_customers(self) -> List[Client]:
+    def list_customers(self, limit: int, after: int | None = None) -> Tuple[List[CustomerRecord], int | None]:
 
-        query = select(Client)
-        return self.session.scalars(query).all()
+        return self._paginate(select(*CUSTOMER_COLUMNS), Client.id, CustomerRecord, limit=limit, after=after)
     
     def list_customer_offers(
         self,
-        client_id: int
-    ) -> List[Offer]:
+        client_id: int,
+        limit: int,
+        after: int | None = None,
+        include_expired: bool = False,
+    ) -> Tuple[List[OfferRecord], int | None]:
         
-        query = select(Offer).where(Offer.client_id == client_id)
-        return self.session.scalars(query).all()
\ No newline at end of file
+        query = select(*OFFER_COLUMNS).where(Offer.client_id == client_id)
+        if not include_expired:
+            # Same rule as CartService._validate_offer: an offer is valid through its valid_until day
+            query = query.where(Offer.valid_until >= date.today())
+
+        return self._paginate(query, Offer.id, OfferRecord, limit=limit, after=after)
+
+    def _paginate(
+        self,
+        query: Select,
+        key: InstrumentedAttribute,
+        record: type,
+        limit: int,
+        after: int | None,
+    ) -> Tuple[list, int | None]:
+
+        if after is not None:
+            query = query.where(key > after)
+
+        # One extra row tells whether another page exists without a COUNT query
+        rows = self.session.execute(query.order_by(key).limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return [record(*row) for row in rows], None
+
+        page = [record(*row) for row in rows[:limit]]
+        return page, getattr(page[-1], key.key)
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Read-through cache for catalog listings.
+
+Entries hold already serialized JSON bodies together with their ETag, so a
+hit costs a single `table_versions` lookup and no Pydantic pass. An entry
+whose ETag no longer matches the counters is reloaded, which covers writes
+committed by any process. Within the process the cache is also cleared
+explicitly through `invalidate_catalog_cache()` and automatically after any
+committed transaction that wrote a Product, Client or Offer.
+
+With read replicas, the read that follows such a commit may come from a
+replica that has not replayed it yet. The process therefore remembers the
+newest `table_versions` counter it has committed or read per table, and
+pages read at an older version are served but not cached (`is_behind`).
+"""
+
+import threading
+from typing import (
+    Mapping,
+    NamedTuple,
+)
+
+from app.cache import TTLCache
+from app.config import (
+    CATALOG_CACHE_TTL_SECONDS,
+    CATALOG_CACHE_MAX_ENTRIES,
+)
+from app.db.table_versions import on_tables_committed
+
+
+class CatalogBody(NamedTuple):
+    etag: str
+    # None when the request's If-None-Match already matches `etag`
+    body: bytes | None
+
+
+catalog_cache: TTLCache[CatalogBody] = TTLCache(
+    maxsize=CATALOG_CACHE_MAX_ENTRIES,
+    ttl=CATALOG_CACHE_TTL_SECONDS,
+)
+
+
+# Newest table_versions counter committed or read by this process, per table
+_newest_versions: dict[str, int] = {}
+_newest_versions_lock = threading.Lock()
+
+
+def invalidate_catalog_cache() -> None:
+
+    catalog_cache.clear()
+
+
+def is_behind(versions: Mapping[str, int]) -> bool:
+
+    """Records `versions` and returns whether any of them is older than the newest seen for its table."""
+
+    behind = False
+    with _newest_versions_lock:
+        for table, version in versions.items():
+            if version < _newest_versions.get(table, version):
+                behind = True
+            else:
+                _newest_versions[table] = version
+
+    return behind
+
+
+@on_tables_committed
+def _invalidate_after_commit(versions: Mapping[str, int]) -> None:
+
+    is_behind(versions)
+    invalidate_catalog_cache()
@@ -0,0 +1,49 @@
+"""
+Read models for the catalog listings.
+
+Each record mirrors its response schema field by field but is a frozen,
+slotted dataclass built straight from a Core row: no identity map, no
+attribute instrumentation and no Pydantic validation per row. `columns_for`
+gives the matching column list, in field order, for the SELECT.
+"""
+
+from dataclasses import (
+    dataclass,
+    fields,
+)
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.db.base import Base
+
+
+@dataclass(frozen=True, slots=True)
+class ProductRecord:
+    id: int
+    ean: str
+    name: str
+    items_per_box: int
+
+
+@dataclass(frozen=True, slots=True)
+class CustomerRecord:
+    id: int
+    name: str
+    cnpj: str
+    address: str
+
+
+@dataclass(frozen=True, slots=True)
+class OfferRecord:
+    id: int
+    client_id: int
+    product_id: int
+    unit_price: Decimal
+    valid_until: date
+
+
+def columns_for(record: type, model: type[Base]) -> tuple[InstrumentedAttribute, ...]:
+
+    return tuple(getattr(model, field.name) for field in fields(record))
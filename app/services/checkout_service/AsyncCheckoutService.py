@@ -0,0 +1,53 @@
+from typing import (
+    List,
+    Tuple,
+)
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import run_in_session
+from app.models.cart import Cart
+from app.models.payment import Payment
+from app.schemas.payment_schema import PaymentBatchResult
+from app.services.cart_service.AsyncCartService import check_cart_items_loaded
+from app.services.checkout_service.CheckoutService import CheckoutService
+
+
+class AsyncCheckoutService:
+
+    """
+    Awaitable variant of CheckoutService.
+
+    The checkout flow itself stays in CheckoutService; this class only runs it
+    through `run_in_session` and checks that the returned cart has its items loaded.
+    """
+
+    def __init__(self, session: AsyncSession | Session):
+
+        self.session = session
+
+    async def start_checkout(self, cart_id: int) -> Cart:
+
+        return await run_in_session(
+            self.session,
+            lambda session: check_cart_items_loaded(
+                CheckoutService(session=session).start_checkout(cart_id=cart_id)
+            ),
+        )
+
+    async def finalize_payment(self, cart_id: int) -> Tuple[Cart, Payment]:
+
+        def finalize(session: Session) -> Tuple[Cart, Payment]:
+            cart, payment = CheckoutService(session=session).finalize_payment(cart_id=cart_id)
+            return check_cart_items_loaded(cart), payment
+
+        return await run_in_session(self.session, finalize)
+
+
+    async def finalize_payments(self, cart_ids: List[int]) -> List[PaymentBatchResult]:
+
+        return await run_in_session(
+            self.session,
+            lambda session: CheckoutService(session=session).finalize_payments(cart_ids=cart_ids),
+        )
\ No newline at end of file
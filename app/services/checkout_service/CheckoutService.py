@@ -1,5 +1,18 @@
-from typing import Tuple
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
 from decimal import Decimal
+from datetime import (
+    datetime,
+    timezone,
+)
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+)
 from sqlalchemy.orm  import Session
 
 from app.models.cart import (
@@ -10,8 +23,11 @@ from app.models.payment import (
     Payment,
     PaymentStatus
 )
+from app.schemas.payment_schema import PaymentBatchResult
 from app.services.cart_service.CartService import CartService
 from app.exceptions import (
+    BusinessException,
+    CartNotFoundError,
     CartIsEmptyError,
     InvalidCartStateError,
 )
@@ -23,8 +39,8 @@ class CheckoutService:
 
     Responsibilities:
     - Transition cart from OPEN to CHECKOUT status
-    - Process payment and transition cart to PAID status
-    - Calculate order totals based on cart items
+    - Process payment and transition cart to PAID status, per cart or in batch
+    - Take order totals from the cart's maintained subtotal
 
     This service orchestrates a linear, happy-path flow where all validations
     are assumed to have been performed upstream. State transitions follow a
@@ -41,8 +57,9 @@ class CheckoutService:
         cart = self.cart_service.validate_cart(
             cart_id=cart_id,
             require_open=True,
+            load_items=True,
         )
-        if not cart.items:
+        if cart.item_count == 0:
             raise CartIsEmptyError()
         
         cart.status = CartStatus.CHECKOUT
@@ -50,7 +67,7 @@ class CheckoutService:
     
     def finalize_payment(self, cart_id: int) -> Tuple[Cart, Payment]:
 
-        cart = self.cart_service.validate_cart(cart_id=cart_id)
+        cart = self.cart_service.validate_cart(cart_id=cart_id, load_items=True)
         if cart.status != CartStatus.CHECKOUT:
             raise InvalidCartStateError("Cannot process payment: cart is not in CHECKOUT status.")
         
@@ -66,8 +83,126 @@ class CheckoutService:
 
         return cart, payment
 
+    def finalize_payments(self, cart_ids: List[int]) -> List[PaymentBatchResult]:
+
+        """
+        Settles many carts in one transaction (end-of-day settlement).
+
+        Uses a fixed number of statements regardless of batch size: one SELECT
+        for the cart states and their maintained totals, one UPDATE moving
+        eligible carts to PAID and one bulk INSERT of payments (dialects without
+        RETURNING add a SELECT ... FOR UPDATE before the UPDATE and read the
+        payment ids back).
+        Carts that cannot be paid are reported individually and do not affect
+        the others.
+        """
+
+        cart_ids = list(dict.fromkeys(cart_ids))
+        errors: Dict[int, BusinessException] = {}
+
+        carts = {
+            cart_id: (status, subtotal, item_count)
+            for cart_id, status, subtotal, item_count in self.session.execute(
+                select(Cart.id, Cart.status, Cart.subtotal, Cart.item_count).where(Cart.id.in_(cart_ids))
+            ).tuples()
+        }
+        totals: Dict[int, Decimal] = {}
+        for cart_id in cart_ids:
+            if cart_id not in carts:
+                errors[cart_id] = CartNotFoundError(f"Cart with id {cart_id} not found.")
+                continue
+
+            status, subtotal, item_count = carts[cart_id]
+            if status != CartStatus.CHECKOUT:
+                errors[cart_id] = InvalidCartStateError("Cannot process payment: cart is not in CHECKOUT status.")
+            elif item_count == 0:
+                errors[cart_id] = CartIsEmptyError()
+            else:
+                # Same amount finalize_payment charges: maintained by CartService
+                totals[cart_id] = subtotal
+
+        eligible = [cart_id for cart_id in cart_ids if cart_id not in errors]
+
+        paid_ids = self._mark_carts_as_paid(cart_ids=eligible)
+        for cart_id in eligible:
+            if cart_id not in paid_ids:
+                # Another request moved the cart out of CHECKOUT after it was read
+                errors[cart_id] = InvalidCartStateError("Cannot process payment: cart is not in CHECKOUT status.")
+
+        payment_ids = self._insert_payments(
+            amounts={cart_id: totals[cart_id] for cart_id in cart_ids if cart_id in paid_ids},
+        )
+
+        return [
+            PaymentBatchResult(
+                cart_id=cart_id,
+                paid=False,
+                error=errors[cart_id].__class__.__name__,
+                detail=errors[cart_id].detail,
+            )
+            if cart_id in errors
+            else PaymentBatchResult(
+                cart_id=cart_id,
+                paid=True,
+                payment_id=payment_ids[cart_id],
+                amount=totals[cart_id],
+            )
+            for cart_id in cart_ids
+        ]
+
+    def _insert_payments(self, amounts: Dict[int, Decimal]) -> Dict[int, int]:
+
+        if not amounts:
+            return {}
+
+        created_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "cart_id": cart_id,
+                "status": PaymentStatus.PAID,
+                "amount": amount,
+                "created_at": created_at,
+            }
+            for cart_id, amount in amounts.items()
+        ]
+
+        if self.session.get_bind().dialect.insert_executemany_returning:
+            return dict(
+                self.session.execute(insert(Payment).returning(Payment.cart_id, Payment.id), rows).tuples().all()
+            )
+
+        # Without RETURNING the new ids are read back: ordered by id, dict() keeps each cart's newest payment
+        self.session.execute(insert(Payment), rows)
+        return dict(
+            self.session.execute(
+                select(Payment.cart_id, Payment.id)
+                .where(Payment.cart_id.in_(amounts))
+                .order_by(Payment.id)
+            ).tuples().all()
+        )
+
+    def _mark_carts_as_paid(self, cart_ids: List[int]) -> set[int]:
+
+        if not cart_ids:
+            return set()
+
+        in_checkout = (Cart.id.in_(cart_ids), Cart.status == CartStatus.CHECKOUT)
+        statement = (
+            update(Cart)
+            .values(status=CartStatus.PAID)
+            .execution_options(synchronize_session=False)
+        )
+
+        if self.session.get_bind().dialect.update_returning:
+            return set(self.session.scalars(statement.where(*in_checkout).returning(Cart.id)).all())
+
+        # Without RETURNING the carts still in CHECKOUT are locked first, so none can leave it before the UPDATE
+        locked_ids = set(self.session.scalars(select(Cart.id).where(*in_checkout).with_for_update()).all())
+        if locked_ids:
+            self.session.execute(statement.where(Cart.id.in_(locked_ids)))
+
+        return locked_ids
+
     def _calculate_total(self, cart: Cart) -> Decimal:
-        return sum(
-            map(lambda item: item.unit_price_snapshot * item.quantity, cart.items), 
-            Decimal("0.00"),
-        )
\ No newline at end of file
+        # Maintained incrementally by CartService as items are added and removed
+        return cart.subtotal
\ No newline at end of file
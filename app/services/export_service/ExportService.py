@@ -0,0 +1,169 @@
+from datetime import (
+    date,
+    datetime,
+    timezone,
+)
+from typing import (
+    AsyncIterator,
+    Iterable,
+    Iterator,
+)
+
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    select,
+    Select,
+)
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.config import (
+    DATA_BASE_ASYNC,
+    EXPORT_YIELD_PER,
+)
+from app.db.connection import (
+    get_read_sessionmaker,
+    get_async_read_sessionmaker,
+)
+from app.exceptions import InvalidDateRangeError
+from app.models.offer import Offer
+from app.models.cart import (
+    Cart,
+    CartStatus,
+)
+from app.models.payment import Payment
+from app.services.catalog_service.catalog_records import (
+    OfferRecord,
+    columns_for,
+)
+from app.services.export_service.export_records import (
+    CartRecord,
+    PaymentRecord,
+)
+
+
+class NdjsonEncoder:
+
+    """Pre-built serializer turning a partition of rows into NDJSON lines."""
+
+    __slots__ = ("record", "adapter")
+
+    def __init__(self, record: type):
+
+        self.record = record
+        self.adapter = TypeAdapter(record)
+
+    def encode(self, rows: Iterable[tuple]) -> bytes:
+
+        record, dump_json = self.record, self.adapter.dump_json
+        return b"".join([dump_json(record(*row)) + b"\n" for row in rows])
+
+
+offers_encoder = NdjsonEncoder(OfferRecord)
+carts_encoder = NdjsonEncoder(CartRecord)
+payments_encoder = NdjsonEncoder(PaymentRecord)
+
+
+class ExportService:
+
+    """
+    Streams full offer, cart and payment listings as NDJSON.
+
+    Rows are fetched with `yield_per` (a server-side cursor where the driver
+    supports one) and encoded one partition at a time, so memory stays bounded
+    by EXPORT_YIELD_PER rows whatever the size of the export.
+
+    A streamed body outlives the request's dependencies, so every export
+    opens and closes its own session from `get_read_sessionmaker`, which reads
+    from the replicas when they are configured. Unlike the catalog's read-only
+    sessions it keeps a transaction: PostgreSQL server-side cursors need one.
+    """
+
+    def export_offers(
+        self,
+        client_id: int | None = None,
+        include_expired: bool = False,
+    ) -> Iterator[bytes] | AsyncIterator[bytes]:
+
+        query = select(*columns_for(OfferRecord, Offer))
+        if client_id is not None:
+            query = query.where(Offer.client_id == client_id)
+        if not include_expired:
+            query = query.where(Offer.valid_until >= date.today())
+
+        return self._stream(query.order_by(Offer.id), offers_encoder)
+
+    def export_carts(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        status: CartStatus | None = None,
+    ) -> Iterator[bytes] | AsyncIterator[bytes]:
+
+        query = self._created_between(select(*columns_for(CartRecord, Cart)), Cart.created_at, since, until)
+        if status is not None:
+            query = query.where(Cart.status == status)
+
+        return self._stream(query.order_by(Cart.created_at, Cart.id), carts_encoder)
+
+    def export_payments(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Iterator[bytes] | AsyncIterator[bytes]:
+
+        query = self._created_between(select(*columns_for(PaymentRecord, Payment)), Payment.created_at, since, until)
+
+        return self._stream(query.order_by(Payment.created_at, Payment.id), payments_encoder)
+
+    def _created_between(
+        self,
+        query: Select,
+        column: InstrumentedAttribute,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Select:
+
+        # `since` is inclusive and `until` exclusive, so consecutive windows never overlap
+        since, until = _as_utc(since), _as_utc(until)
+        if since is not None and until is not None and since >= until:
+            raise InvalidDateRangeError()
+
+        if since is not None:
+            query = query.where(column >= since)
+        if until is not None:
+            query = query.where(column < until)
+
+        return query
+
+    def _stream(self, query: Select, encoder: NdjsonEncoder) -> Iterator[bytes] | AsyncIterator[bytes]:
+
+        query = query.execution_options(yield_per=EXPORT_YIELD_PER)
+        if DATA_BASE_ASYNC:
+            return _stream_async(query, encoder)
+
+        return _stream_sync(query, encoder)
+
+
+def _stream_sync(query: Select, encoder: NdjsonEncoder) -> Iterator[bytes]:
+
+    # StreamingResponse iterates sync generators in the threadpool, one chunk at a time
+    with get_read_sessionmaker()() as db:
+        for rows in db.execute(query).partitions():
+            yield encoder.encode(rows)
+
+
+async def _stream_async(query: Select, encoder: NdjsonEncoder) -> AsyncIterator[bytes]:
+
+    async with get_async_read_sessionmaker()() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+
+    # created_at columns hold naive UTC timestamps
+    if value is None or value.tzinfo is None:
+        return value
+
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
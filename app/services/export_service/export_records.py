@@ -0,0 +1,32 @@
+"""
+Read models for the NDJSON exports.
+
+Like the catalog records, they are built straight from Core rows; offers
+reuse `OfferRecord` from the catalog.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.cart import CartStatus
+from app.models.payment import PaymentStatus
+
+
+@dataclass(frozen=True, slots=True)
+class CartRecord:
+    id: int
+    client_id: int
+    status: CartStatus
+    created_at: datetime
+    subtotal: Decimal
+    item_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentRecord:
+    id: int
+    cart_id: int
+    status: PaymentStatus
+    amount: Decimal
+    created_at: datetime
@@ -0,0 +1,45 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import run_in_session
+from app.services.idempotency_service.IdempotencyService import (
+    IdempotencyService,
+    StoredResponse,
+)
+
+
+class AsyncIdempotencyService:
+
+    """
+    Awaitable variant of IdempotencyService.
+
+    A key found in the in-memory store is answered without touching the
+    database at all; only misses fall back to the idempotency_keys table.
+    """
+
+    def __init__(self, session: AsyncSession | Session):
+
+        self.session = session
+
+    async def lookup(self, key: str, scope: str) -> StoredResponse | None:
+
+        stored = IdempotencyService.lookup_cached(key=key, scope=scope)
+        if stored is not None:
+            return stored
+
+        return await run_in_session(
+            self.session,
+            lambda session: IdempotencyService(session=session).lookup(key=key, scope=scope),
+        )
+
+    async def save(self, key: str, scope: str, status_code: int, body: bytes) -> None:
+
+        await run_in_session(
+            self.session,
+            lambda session: IdempotencyService(session=session).save(
+                key=key,
+                scope=scope,
+                status_code=status_code,
+                body=body,
+            ),
+        )
@@ -0,0 +1,130 @@
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import (
+    IDEMPOTENCY_TTL_SECONDS,
+    IDEMPOTENCY_CACHE_MAX_ENTRIES,
+)
+from app.models.idempotency_key import IdempotencyKey
+from app.exceptions import (
+    IdempotencyKeyReusedError,
+    IdempotencyRequestInProgressError,
+)
+
+
+class StoredResponse(NamedTuple):
+    scope: str
+    status_code: int
+    body: bytes
+
+
+idempotency_cache: TTLCache[StoredResponse] = TTLCache(
+    maxsize=IDEMPOTENCY_CACHE_MAX_ENTRIES,
+    ttl=IDEMPOTENCY_TTL_SECONDS,
+)
+
+
+class IdempotencyService:
+
+    """
+    Stores and replays responses of requests sent with an Idempotency-Key.
+
+    Responsibilities:
+    - Find the stored response of a key, first in memory, then in the database
+    - Reject a key reused for a different request (scope)
+    - Persist a new response in the request transaction, so it is recorded
+      if and only if the operation it describes is committed
+
+    Only successful responses are stored; a request that failed can be retried.
+    When two requests with the same key race past `lookup`, the one that
+    stores its response second fails with IdempotencyRequestInProgressError
+    (409) and its transaction is rolled back; its retry gets the replay.
+    """
+
+    def __init__(self, session: Session):
+
+        self.session = session
+
+    @staticmethod
+    def lookup_cached(key: str, scope: str) -> StoredResponse | None:
+
+        return _check_scope(idempotency_cache.get(key), scope)
+
+    def lookup(self, key: str, scope: str) -> StoredResponse | None:
+
+        stored = idempotency_cache.get(key)
+        if stored is None:
+            stored = self._load(key=key)
+
+        return _check_scope(stored, scope)
+
+    def save(self, key: str, scope: str, status_code: int, body: bytes) -> None:
+
+        # The savepoint keeps the transaction usable when the key was stored concurrently
+        try:
+            with self.session.begin_nested():
+                self.session.add(
+                    IdempotencyKey(
+                        key=key,
+                        scope=scope,
+                        status_code=status_code,
+                        response_body=body.decode(),
+                    )
+                )
+        except IntegrityError:
+            raise IdempotencyRequestInProgressError()
+
+        stored = StoredResponse(scope=scope, status_code=status_code, body=body)
+        event.listen(
+            self.session,
+            "after_commit",
+            lambda _: idempotency_cache.set(key, stored),
+            once=True,
+        )
+
+    def _load(self, key: str) -> StoredResponse | None:
+
+        row = self.session.get(IdempotencyKey, key)
+        if row is None:
+            return None
+
+        if _is_expired(row.created_at):
+            # Frees the key so this request can store its own response
+            self.session.delete(row)
+            self.session.flush()
+            return None
+
+        stored = StoredResponse(
+            scope=row.scope,
+            status_code=row.status_code,
+            body=row.response_body.encode(),
+        )
+        idempotency_cache.set(key, stored)
+
+        return stored
+
+
+def _check_scope(stored: StoredResponse | None, scope: str) -> StoredResponse | None:
+
+    if stored is not None and stored.scope != scope:
+        raise IdempotencyKeyReusedError()
+
+    return stored
+
+
+def _is_expired(created_at: datetime) -> bool:
+
+    # SQLite returns naive datetimes; they were written in UTC
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+
+    return created_at < datetime.now(timezone.utc) - timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
@@ -0,0 +1,241 @@
+import logging
+from datetime import (
+    date,
+    datetime,
+)
+from typing import Sequence
+
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    func,
+    or_,
+    and_,
+    case,
+    false,
+    literal,
+    DateTime,
+    Table,
+    ColumnElement,
+)
+from sqlalchemy.orm import Session
+
+from app.models.cart import (
+    Cart,
+    CartStatus,
+)
+from app.models.cart_item import CartItem
+from app.models.idempotency_key import IdempotencyKey
+from app.models.offer import Offer
+from app.models.payment import Payment
+from app.models.cart_history import CartHistory
+from app.models.cart_item_history import CartItemHistory
+from app.models.payment_history import PaymentHistory
+
+logger = logging.getLogger("app.maintenance")
+
+
+class MaintenanceService:
+
+    """
+    Housekeeping batches run by the background sweeper (app.sweeper).
+
+    Responsibilities:
+    - Delete offers expired before a cutoff that no cart item references
+    - Move carts left OPEN since before a cutoff to EXPIRED
+    - Move PAID carts, with their items and payments, to the history tables
+    - Delete Idempotency-Key responses stored before a cutoff (no longer replayed)
+
+    Each call handles at most `limit` rows (carts, for the archival) and
+    returns how many it changed. Ids are selected first, which keeps the
+    statements portable (no LIMIT in UPDATE/DELETE); the writes re-check the
+    condition, or lock the selected rows for the archival, so rows changed in
+    between are left alone. Committing is up to the caller.
+    """
+
+    def __init__(self, session: Session):
+
+        self.session = session
+
+    def delete_expired_offers(self, valid_before: date, limit: int) -> int:
+
+        # Offers still referenced by a cart item stay: they are part of that cart's history
+        referenced = select(CartItem.id).where(CartItem.offer_id == Offer.id).exists()
+        conditions = (Offer.valid_until < valid_before, ~referenced)
+
+        offer_ids = self.session.scalars(
+            select(Offer.id).where(*conditions).order_by(Offer.id).limit(limit)
+        ).all()
+        if not offer_ids:
+            return 0
+
+        result = self.session.execute(
+            delete(Offer)
+            .where(Offer.id.in_(offer_ids), *conditions)
+            .execution_options(synchronize_session=False)
+        )
+
+        return result.rowcount
+
+    def expire_open_carts(self, created_before: datetime, limit: int) -> int:
+
+        conditions = (Cart.status == CartStatus.OPEN, Cart.created_at < created_before)
+
+        cart_ids = self.session.scalars(
+            select(Cart.id).where(*conditions).order_by(Cart.id).limit(limit)
+        ).all()
+        if not cart_ids:
+            return 0
+
+        result = self.session.execute(
+            update(Cart)
+            .where(Cart.id.in_(cart_ids), *conditions)
+            .values(status=CartStatus.EXPIRED)
+            .execution_options(synchronize_session=False)
+        )
+
+        return result.rowcount
+
+    def delete_expired_idempotency_keys(self, created_before: datetime, limit: int) -> int:
+
+        keys = self.session.scalars(
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.created_at < created_before)
+            .order_by(IdempotencyKey.created_at)
+            .limit(limit)
+        ).all()
+        if not keys:
+            return 0
+
+        result = self.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key.in_(keys), IdempotencyKey.created_at < created_before)
+            .execution_options(synchronize_session=False)
+        )
+
+        return result.rowcount
+
+    def archive_paid_carts(self, paid_before: datetime, archived_at: datetime, limit: int) -> int:
+
+        recent_payment = select(Payment.id).where(
+            Payment.cart_id == Cart.id,
+            Payment.created_at >= paid_before,
+        ).exists()
+
+        archivable = (Cart.status == CartStatus.PAID, ~recent_payment)
+        in_history, holds_newest_id = self._id_collisions()
+
+        # SKIP LOCKED lets concurrent workers take different batches (ignored where unsupported)
+        cart_ids = self.session.scalars(
+            select(Cart.id)
+            .where(*archivable, ~in_history, ~holds_newest_id)
+            .order_by(Cart.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if len(cart_ids) < limit:
+            # Last batch of the pass: report what the id guards kept back
+            self._log_held_back_carts(archivable, in_history, holds_newest_id)
+        if not cart_ids:
+            return 0
+
+        # Parents first on the way in, children first on the way out
+        self._copy(Cart.__table__, CartHistory.__table__, Cart.id, cart_ids, archived_at)
+        self._copy(CartItem.__table__, CartItemHistory.__table__, CartItem.cart_id, cart_ids)
+        self._copy(Payment.__table__, PaymentHistory.__table__, Payment.cart_id, cart_ids)
+
+        self.session.execute(delete(Payment.__table__).where(Payment.cart_id.in_(cart_ids)))
+        self.session.execute(delete(CartItem.__table__).where(CartItem.cart_id.in_(cart_ids)))
+        self.session.execute(delete(Cart.__table__).where(Cart.id.in_(cart_ids)))
+
+        return len(cart_ids)
+
+    def _id_collisions(self) -> tuple[ColumnElement[bool], ColumnElement[bool]]:
+
+        """
+        Conditions matching carts whose archival could collide with history.
+
+        Tables without AUTOINCREMENT (SQLite databases created before it, MySQL
+        before 8.0 after a restart) hand out max(id) + 1, so deleting the row
+        holding the highest id lets the next insert reuse it. Carts holding the
+        current highest cart, item or payment id (second condition) wait until
+        a newer row exists; carts that already got a reused id, found in the
+        history tables (first condition), are never archived.
+        """
+
+        max_cart_id, max_item_id, max_payment_id = self.session.execute(
+            select(
+                select(func.max(Cart.id)).scalar_subquery(),
+                select(func.max(CartItem.id)).scalar_subquery(),
+                select(func.max(Payment.id)).scalar_subquery(),
+            )
+        ).one()
+
+        in_history = or_(
+            select(CartHistory.id).where(CartHistory.id == Cart.id).exists(),
+            select(CartItem.id)
+            .join(CartItemHistory, CartItemHistory.id == CartItem.id)
+            .where(CartItem.cart_id == Cart.id)
+            .exists(),
+            select(Payment.id)
+            .join(PaymentHistory, PaymentHistory.id == Payment.id)
+            .where(Payment.cart_id == Cart.id)
+            .exists(),
+        )
+
+        newest = []
+        if max_cart_id is not None:
+            newest.append(Cart.id == max_cart_id)
+        if max_item_id is not None:
+            newest.append(select(CartItem.id).where(CartItem.cart_id == Cart.id, CartItem.id == max_item_id).exists())
+        if max_payment_id is not None:
+            newest.append(select(Payment.id).where(Payment.cart_id == Cart.id, Payment.id == max_payment_id).exists())
+
+        return in_history, or_(false(), *newest)
+
+    def _log_held_back_carts(
+        self,
+        archivable: tuple[ColumnElement[bool], ...],
+        in_history: ColumnElement[bool],
+        holds_newest_id: ColumnElement[bool],
+    ) -> None:
+
+        reused, waiting = self.session.execute(
+            select(
+                func.count(case((in_history, 1))),
+                func.count(case((and_(~in_history, holds_newest_id), 1))),
+            )
+            .select_from(Cart)
+            .where(*archivable, or_(in_history, holds_newest_id))
+        ).one()
+
+        if reused:
+            logger.warning(
+                "%d paid cart(s) not archived: their id, or an item or payment id, already exists in the history "
+                "tables (ids reused by a table without AUTOINCREMENT); they stay in the live tables",
+                reused,
+            )
+        if waiting:
+            logger.info("%d paid cart(s) held back until a newer cart, item or payment exists", waiting)
+
+    def _copy(
+        self,
+        source: Table,
+        target: Table,
+        key,
+        cart_ids: Sequence[int],
+        archived_at: datetime | None = None,
+    ) -> None:
+
+        # INSERT ... SELECT: the rows never travel through Python
+        names = [column.name for column in source.columns]
+        columns = list(source.columns)
+        if archived_at is not None:
+            names.append("archived_at")
+            columns.append(literal(archived_at, DateTime))
+
+        self.session.execute(
+            insert(target).from_select(names, select(*columns).where(key.in_(cart_ids)))
+        )
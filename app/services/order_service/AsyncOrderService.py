@@ -0,0 +1,24 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.connection import run_in_session
+from app.services.order_service.OrderService import (
+    Order,
+    OrderService,
+)
+
+
+class AsyncOrderService:
+
+    """Awaitable variant of OrderService, run through `run_in_session`."""
+
+    def __init__(self, session: AsyncSession | Session):
+
+        self.session = session
+
+    async def get_order(self, cart_id: int) -> Order:
+
+        return await run_in_session(
+            self.session,
+            lambda session: OrderService(session=session).get_order(cart_id=cart_id),
+        )
@@ -0,0 +1,56 @@
+from typing import (
+    List,
+    NamedTuple,
+)
+
+from sqlalchemy import select
+from sqlalchemy.orm import (
+    Session,
+    selectinload,
+)
+
+from app.models.cart import Cart
+from app.models.payment import Payment
+from app.models.cart_history import CartHistory
+from app.models.payment_history import PaymentHistory
+from app.exceptions import CartNotFoundError
+
+
+class Order(NamedTuple):
+    cart: Cart | CartHistory
+    payments: List[Payment] | List[PaymentHistory]
+    archived: bool
+
+
+class OrderService:
+
+    """
+    Looks up an order (a cart with its items and payments) by cart id.
+
+    Responsibilities:
+    - Read the live tables first, where every OPEN/CHECKOUT cart and recent order lives
+    - Fall back to the history tables for carts moved there by the archival job
+    """
+
+    def __init__(self, session: Session):
+
+        self.session = session
+
+    def get_order(self, cart_id: int) -> Order:
+
+        cart = self.session.get(Cart, cart_id, options=[selectinload(Cart.items)])
+        if cart is not None:
+            payments = self.session.scalars(
+                select(Payment).where(Payment.cart_id == cart_id).order_by(Payment.id)
+            ).all()
+            return Order(cart=cart, payments=list(payments), archived=False)
+
+        archived_cart = self.session.get(
+            CartHistory,
+            cart_id,
+            options=[selectinload(CartHistory.items), selectinload(CartHistory.payments)],
+        )
+        if archived_cart is None:
+            raise CartNotFoundError(f"Cart with id {cart_id} not found.")
+
+        return Order(cart=archived_cart, payments=archived_cart.payments, archived=True)
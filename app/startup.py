@@ -0,0 +1,50 @@
+"""
+Cold-start timing.
+
+Phases are recorded while the application boots (import of app.main, engine
+creation, schema check) and served by GET /admin/startup, so the cost of a
+worker start can be tracked across releases.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Iterator,
+)
+
+
+class StartupReport:
+
+    def __init__(self):
+
+        self.phases: dict[str, float] = {}
+        self.schema_created: bool | None = None
+
+    def record(self, phase: str, seconds: float) -> None:
+
+        self.phases[phase] = round(seconds * 1000, 3)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def as_dict(self) -> dict[str, Any]:
+
+        return {
+            "phases_ms": dict(self.phases),
+            "total_ms": round(sum(self.phases.values()), 3),
+            "schema_created": self.schema_created,
+        }
+
+    def summary(self) -> str:
+
+        return " | ".join(f"{name} {ms:.0f}ms" for name, ms in self.phases.items())
+
+
+startup_report = StartupReport()
@@ -0,0 +1,262 @@
+"""
+Background maintenance sweeper.
+
+Started by the application lifespan, it runs every `interval` seconds:
+
+- offers: deletes offers whose valid_until is more than OFFER_EXPIRY_GRACE_DAYS
+  in the past and that no cart item references
+- carts: marks carts still OPEN CART_OPEN_TTL_HOURS after creation as EXPIRED
+- archive: moves carts paid more than ARCHIVE_PAID_CARTS_AFTER_DAYS ago, with
+  their items and payments, to the *_history tables (skipped when set to 0)
+- idempotency: deletes Idempotency-Key responses older than
+  IDEMPOTENCY_TTL_SECONDS, which are no longer replayed
+
+Each job works in batches of `batch_size` rows, one transaction per batch on
+the primary, stopping after `max_batches` per pass (the rest waits for the
+next pass). It sleeps `batch_pause` seconds between batches and holds a batch
+back while more than `max_in_flight` requests are being served, so it never
+competes with request traffic. Row counts are exposed at /metrics and
+GET /admin/sweeper.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Any,
+    Callable,
+)
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import (
+    DATA_BASE_ASYNC,
+    SWEEPER_INTERVAL_SECONDS,
+    SWEEPER_BATCH_SIZE,
+    SWEEPER_MAX_BATCHES,
+    SWEEPER_BATCH_PAUSE_SECONDS,
+    SWEEPER_MAX_IN_FLIGHT,
+    OFFER_EXPIRY_GRACE_DAYS,
+    CART_OPEN_TTL_HOURS,
+    ARCHIVE_PAID_CARTS_AFTER_DAYS,
+    IDEMPOTENCY_TTL_SECONDS,
+)
+from app.db.connection import (
+    get_sessionmaker,
+    get_async_sessionmaker,
+)
+from app.middleware.metrics import (
+    RequestMetrics,
+    request_metrics,
+)
+from app.services.maintenance_service.MaintenanceService import MaintenanceService
+
+logger = logging.getLogger("app.sweeper")
+
+
+@dataclass(frozen=True, slots=True)
+class SweepJob:
+
+    name: str
+    # Handles at most `limit` rows in the given session and returns how many it changed
+    run: Callable[[Session, int], int]
+
+
+def _delete_expired_offers(db: Session, limit: int) -> int:
+
+    valid_before = date.today() - timedelta(days=OFFER_EXPIRY_GRACE_DAYS)
+    return MaintenanceService(db).delete_expired_offers(valid_before, limit)
+
+
+def _expire_open_carts(db: Session, limit: int) -> int:
+
+    # created_at holds naive UTC timestamps
+    created_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=CART_OPEN_TTL_HOURS)
+    return MaintenanceService(db).expire_open_carts(created_before, limit)
+
+
+def _archive_paid_carts(db: Session, limit: int) -> int:
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    paid_before = now - timedelta(days=ARCHIVE_PAID_CARTS_AFTER_DAYS)
+    return MaintenanceService(db).archive_paid_carts(paid_before, archived_at=now, limit=limit)
+
+
+def _delete_expired_idempotency_keys(db: Session, limit: int) -> int:
+
+    # created_at holds naive UTC timestamps on SQLite
+    created_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    return MaintenanceService(db).delete_expired_idempotency_keys(created_before, limit)
+
+
+DEFAULT_JOBS = (
+    SweepJob("offers", _delete_expired_offers),
+    SweepJob("carts", _expire_open_carts),
+    *((SweepJob("archive", _archive_paid_carts),) if ARCHIVE_PAID_CARTS_AFTER_DAYS else ()),
+    SweepJob("idempotency", _delete_expired_idempotency_keys),
+)
+
+
+class Sweeper:
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        max_batches: int,
+        batch_pause: float,
+        max_in_flight: int,
+        jobs: tuple[SweepJob, ...] = DEFAULT_JOBS,
+        metrics: RequestMetrics = request_metrics,
+    ):
+
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.batch_pause = batch_pause
+        self.max_in_flight = max_in_flight
+        self.jobs = jobs
+        self.metrics = metrics
+        self.task: asyncio.Task | None = None
+        # Counters are only updated on the event loop thread, like RequestMetrics
+        self.rows = {job.name: 0 for job in jobs}
+        self.batches = {job.name: 0 for job in jobs}
+        self.errors = {job.name: 0 for job in jobs}
+        self.passes = 0
+        self.deferred = 0
+        self.last_pass_at: float | None = None
+        self.last_pass_ms: float | None = None
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+
+        if self.task is None:
+            self.task = asyncio.create_task(self._loop(), name="sweeper")
+
+    async def stop(self) -> None:
+
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.task
+        self.task = None
+
+    async def _loop(self) -> None:
+
+        # First pass after one interval, not while the worker is warming up
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    async def run_once(self) -> None:
+
+        started = time.perf_counter()
+        for job in self.jobs:
+            try:
+                await self._sweep(job)
+            except Exception as exc:
+                self.errors[job.name] += 1
+                self.last_error = f"{job.name}: {exc.__class__.__name__}: {exc}"
+                logger.exception("Sweeper job %s failed", job.name)
+
+        self.passes += 1
+        self.last_pass_at = time.time()
+        self.last_pass_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    async def _sweep(self, job: SweepJob) -> None:
+
+        for batch in range(self.max_batches):
+            if batch:
+                await asyncio.sleep(self.batch_pause)
+            await self._wait_for_quiet()
+
+            rows = await self._run_batch(job)
+            self.batches[job.name] += 1
+            self.rows[job.name] += rows
+            if rows < self.batch_size:
+                return
+
+    async def _wait_for_quiet(self) -> None:
+
+        # in_flight is maintained by MetricsMiddleware; it stays 0 when METRICS_ENABLED is off
+        while self.metrics.in_flight > self.max_in_flight:
+            self.deferred += 1
+            await asyncio.sleep(self.batch_pause)
+
+    async def _run_batch(self, job: SweepJob) -> int:
+
+        if DATA_BASE_ASYNC:
+            async with get_async_sessionmaker()() as db:
+                rows = await db.run_sync(job.run, self.batch_size)
+                await db.commit()
+            return rows
+
+        return await run_in_threadpool(self._run_sync_batch, job)
+
+    def _run_sync_batch(self, job: SweepJob) -> int:
+
+        with get_sessionmaker()() as db:
+            rows = job.run(db, self.batch_size)
+            db.commit()
+
+        return rows
+
+    def status(self) -> dict[str, Any]:
+
+        return {
+            "running": self.task is not None and not self.task.done(),
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "passes": self.passes,
+            "deferred_batches": self.deferred,
+            "last_pass_at": self.last_pass_at,
+            "last_pass_ms": self.last_pass_ms,
+            "last_error": self.last_error,
+            "jobs": {
+                job.name: {
+                    "rows": self.rows[job.name],
+                    "batches": self.batches[job.name],
+                    "errors": self.errors[job.name],
+                }
+                for job in self.jobs
+            },
+        }
+
+    def render(self) -> str:
+
+        lines = []
+        for name, help_text, values in (
+            ("sweeper_rows_total", "Rows deleted, expired or archived (carts) by the maintenance sweeper.", self.rows),
+            ("sweeper_batches_total", "Batches run by the maintenance sweeper.", self.batches),
+            ("sweeper_errors_total", "Sweeper batches that failed.", self.errors),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{job="{job}"}} {value}' for job, value in values.items()]
+
+        lines += [
+            "# HELP sweeper_deferred_batches_total Batches held back while request traffic was high.",
+            "# TYPE sweeper_deferred_batches_total counter",
+            f"sweeper_deferred_batches_total {self.deferred}",
+        ]
+
+        return "\n".join(lines) + "\n"
+
+
+sweeper = Sweeper(
+    interval=SWEEPER_INTERVAL_SECONDS,
+    batch_size=SWEEPER_BATCH_SIZE,
+    max_batches=SWEEPER_MAX_BATCHES,
+    batch_pause=SWEEPER_BATCH_PAUSE_SECONDS,
+    max_in_flight=SWEEPER_MAX_IN_FLIGHT,
+)
@@ -0,0 +1,135 @@
+"""
+Micro-benchmark of response encoding for the catalog listings.
+
+Compares, for synthetic pages of products and offers:
+
+- default:    jsonable_encoder + JSONResponse (FastAPI's path before FastJSONResponse)
+- fast:       Pydantic JSON-mode dump + FastJSONResponse (orjson)
+- preencoded: TypeAdapter.dump_json over validated schemas
+- records:    PageEncoder over slotted records, as used by the catalog routes
+
+and reports encode time plus body size uncompressed, gzip and brotli.
+
+Usage:
+    python -m benchmarks.encode_bench --rows 5000 --repeat 20
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.config import (
+    RESPONSE_GZIP_LEVEL,
+    RESPONSE_BROTLI_QUALITY,
+)
+from app.responses import FastJSONResponse
+from app.schemas.pagination_schema import Page
+from app.schemas.products_schema import ProductSchema
+from app.schemas.offers_schema import OfferSchema
+from app.services.catalog_service.AsyncCatalogService import PageEncoder
+from app.services.catalog_service.catalog_records import (
+    ProductRecord,
+    OfferRecord,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_products(rows: int, rng: random.Random) -> Page[ProductSchema]:
+
+    return Page[ProductSchema](
+        items=[
+            ProductSchema(
+                id=index,
+                ean=f"789{index:010d}",
+                name=f"Produto {index} - {rng.choice(['1kg', '500g', '2L', '350ml'])}",
+                items_per_box=rng.choice([6, 10, 12, 24]),
+            )
+            for index in range(1, rows + 1)
+        ],
+        next_cursor=rows,
+    )
+
+
+def build_offers(rows: int, rng: random.Random) -> Page[OfferSchema]:
+
+    today = date.today()
+    return Page[OfferSchema](
+        items=[
+            OfferSchema(
+                id=index,
+                client_id=1,
+                product_id=index,
+                unit_price=Decimal(rng.randint(100, 5000)) / 100,
+                valid_until=today + timedelta(days=rng.randint(1, 90)),
+            )
+            for index in range(1, rows + 1)
+        ],
+        next_cursor=rows,
+    )
+
+
+def encoders(page, record: type) -> dict[str, Callable[[], bytes]]:
+
+    adapter = TypeAdapter(type(page))
+    encoder = PageEncoder(record)
+    records = [record(**item.model_dump()) for item in page.items]
+    return {
+        "default": lambda: JSONResponse(jsonable_encoder(page)).body,
+        "fast": lambda: FastJSONResponse(page.model_dump(mode="json")).body,
+        "preencoded": lambda: adapter.dump_json(page),
+        "records": lambda: encoder.dump_json(records, page.next_cursor),
+    }
+
+
+def measure(fn: Callable[[], bytes], repeat: int) -> tuple[float, float, bytes]:
+
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings), min(timings), body
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="items per page")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per encoder")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = {
+        "products": (build_products(args.rows, rng), ProductRecord),
+        "offers": (build_offers(args.rows, rng), OfferRecord),
+    }
+
+    header = f"{'resource':<10} {'encoder':<11} {'median ms':>10} {'min ms':>8} {'bytes':>10} {'gzip':>9} {'br':>9}"
+    print(header)
+    print("-" * len(header))
+    for resource, (page, record) in pages.items():
+        for name, fn in encoders(page, record).items():
+            median, fastest, body = measure(fn, args.repeat)
+            gzip_size = len(gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL))
+            br_size = len(brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)) if brotli else "-"
+            print(f"{resource:<10} {name:<11} {median:>10.2f} {fastest:>8.2f} {len(body):>10} {gzip_size:>9} {br_size:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""
+End-to-end latency benchmark for the catalog, cart and checkout routes.
+
+Builds a SQLite database with `app.db.seed_database`, boots the app with
+uvicorn in a subprocess and drives it over HTTP/1.1 keep-alive connections
+from `--concurrency` threads:
+
+- catalog: each listing is hammered on its own, so its throughput is its own
+- flow:    create cart -> add offer -> bulk add -> remove item -> checkout ->
+           payment (single, or settled in groups through /payments/batch);
+           the throughput of each step is that of the whole flow
+
+Reports requests, errors, throughput and p50/p95/p99 latency per endpoint.
+`--save` stores the run as a JSON baseline; `--compare` flags endpoints whose
+p95/p99 grew (or throughput fell) by more than `--threshold` and exits with 1.
+
+Usage:
+    python -m benchmarks.latency_bench --concurrency 8 --iterations 400 --save baseline.json
+    python -m benchmarks.latency_bench --concurrency 8 --iterations 400 --compare baseline.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+API = "/api/v1"
+ROOT = Path(__file__).resolve().parent.parent
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class Recorder:
+
+    """Thread-safe latency samples (ms) and error counts per endpoint."""
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.wall_times: dict[str, float] = {}
+
+    def record(self, name: str, elapsed_ms: float, ok: bool) -> None:
+
+        with self.lock:
+            self.samples[name].append(elapsed_ms)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+
+        result = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            wall = self.wall_times.get(name) or 0
+            result[name] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(name, 0),
+                "throughput_rps": round(len(ordered) / wall, 2) if wall else None,
+                "mean_ms": round(sum(ordered) / len(ordered), 3),
+                "p50_ms": round(percentile(ordered, 50), 3),
+                "p95_ms": round(percentile(ordered, 95), 3),
+                "p99_ms": round(percentile(ordered, 99), 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+
+        return result
+
+
+class ApiClient:
+
+    """One keep-alive connection per thread, reopened after a transport error."""
+
+    def __init__(self, port: int, recorder: Recorder | None):
+
+        self.port = port
+        self.recorder = recorder
+        self.local = threading.local()
+
+    def call(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+        expected: tuple[int, ...] = (200,),
+    ) -> Any:
+
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {**JSON_HEADERS, **(headers or {})} if payload is not None else headers or {}
+
+        started = time.perf_counter()
+        try:
+            status, data = self._send(method, API + path, payload, headers)
+        except (OSError, http.client.HTTPException):
+            self.local.connection = None
+            status, data = None, b""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        ok = status in expected
+        if self.recorder is not None:
+            self.recorder.record(name, elapsed_ms, ok)
+        if not ok or not data:
+            return None
+
+        return json.loads(data)
+
+    def _send(self, method: str, path: str, payload: bytes | None, headers: dict[str, str]) -> tuple[int, bytes]:
+
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+
+def percentile(ordered: list[float], p: float) -> float:
+
+    # Nearest-rank percentile of an already sorted sample
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def run_parallel(concurrency: int, worker: Callable[[int], None]) -> float:
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, index) for index in range(concurrency)]:
+            future.result()
+
+    return time.perf_counter() - started
+
+
+def catalog_scenarios(client_ids: list[int]) -> dict[str, Callable[[ApiClient, random.Random], None]]:
+
+    etag: dict[str, str] = {}
+
+    def products(api: ApiClient, rng: random.Random) -> None:
+        api.call("GET /catalog/products", "GET", "/catalog/products")
+
+    def products_not_modified(api: ApiClient, rng: random.Random) -> None:
+        if "products" not in etag:
+            connection = http.client.HTTPConnection("127.0.0.1", api.port, timeout=30)
+            connection.request("GET", f"{API}/catalog/products")
+            response = connection.getresponse()
+            response.read()
+            etag["products"] = response.getheader("ETag", "")
+            connection.close()
+        api.call(
+            "GET /catalog/products [If-None-Match]",
+            "GET",
+            "/catalog/products",
+            headers={"If-None-Match": etag["products"]},
+            expected=(304,),
+        )
+
+    def customers(api: ApiClient, rng: random.Random) -> None:
+        api.call("GET /catalog/customers", "GET", "/catalog/customers")
+
+    def offers(api: ApiClient, rng: random.Random) -> None:
+        api.call("GET /catalog/client/offers/{client_id}", "GET", f"/catalog/client/offers/{rng.choice(client_ids)}")
+
+    return {
+        "GET /catalog/products": products,
+        "GET /catalog/products [If-None-Match]": products_not_modified,
+        "GET /catalog/customers": customers,
+        "GET /catalog/client/offers/{client_id}": offers,
+    }
+
+
+class CartFlow:
+
+    """
+    Drives one worker's share of cart flows over its own clients.
+
+    A client may have a single cart in progress, so each worker owns the clients
+    with `client_id % concurrency == worker`; carts waiting for a batch payment
+    are settled before their client is reused.
+    """
+
+    def __init__(self, api: ApiClient, offers: dict[int, list[int]], clients: list[int], batch_size: int, rng: random.Random):
+
+        self.api = api
+        self.offers = offers
+        self.clients = clients
+        self.batch_size = batch_size
+        self.rng = rng
+        self.pending: dict[int, int] = {}
+
+    def run(self, iteration: int) -> None:
+
+        client_id = self.clients[iteration % len(self.clients)]
+        if client_id in self.pending:
+            self.settle()
+
+        cart = self.api.call(
+            "POST /cart/create-cart/{client_id}", "POST", f"/cart/create-cart/{client_id}", expected=(201,),
+        )
+        if cart is None:
+            return
+
+        cart_id = cart["id"]
+        first, *others = self.rng.sample(self.offers[client_id], min(6, len(self.offers[client_id])))
+        cart = self.api.call(
+            "POST /cart/{cart_id}/items", "POST", f"/cart/{cart_id}/items",
+            body={"offer_id": first, "quantity": self.rng.randint(1, 10)},
+        )
+        if others:
+            self.api.call(
+                "POST /cart/{cart_id}/items/bulk", "POST", f"/cart/{cart_id}/items/bulk",
+                body={"items": [{"offer_id": offer_id, "quantity": self.rng.randint(1, 10)} for offer_id in others]},
+            )
+            if cart and cart["items"]:
+                self.api.call(
+                    "DELETE /cart/{cart_id}/items/{cart_item_id}", "DELETE",
+                    f"/cart/{cart_id}/items/{cart['items'][0]['id']}",
+                )
+
+        if self.api.call(
+            "POST /checkout/{cart_id}", "POST", f"/checkout/{cart_id}",
+            headers={"Idempotency-Key": str(uuid.uuid4())},
+        ) is None:
+            return
+
+        if iteration % 2 == 0:
+            self.api.call(
+                "POST /checkout/payment/{cart_id}", "POST", f"/checkout/payment/{cart_id}",
+                headers={"Idempotency-Key": str(uuid.uuid4())},
+            )
+            return
+
+        self.pending[client_id] = cart_id
+        if len(self.pending) >= self.batch_size:
+            self.settle()
+
+    def settle(self) -> None:
+
+        if self.pending:
+            self.api.call(
+                "POST /checkout/payments/batch", "POST", "/checkout/payments/batch",
+                body={"cart_ids": list(self.pending.values())},
+            )
+            self.pending.clear()
+
+
+def run_catalog(port: int, recorder: Recorder | None, client_ids: list[int], args: argparse.Namespace) -> None:
+
+    for name, scenario in catalog_scenarios(client_ids).items():
+        api = ApiClient(port, recorder)
+
+        def worker(index: int) -> None:
+            rng = random.Random(args.seed + index)
+            for _ in range(args.iterations // args.concurrency):
+                scenario(api, rng)
+
+        wall = run_parallel(args.concurrency, worker)
+        if recorder is not None:
+            recorder.wall_times[name] = wall
+
+
+def run_flows(
+    port: int,
+    recorder: Recorder | None,
+    offers: dict[int, list[int]],
+    iterations: int,
+    args: argparse.Namespace,
+) -> None:
+
+    api = ApiClient(port, recorder)
+    client_ids = sorted(offers)
+
+    def worker(index: int) -> None:
+        clients = [client_id for client_id in client_ids if client_id % args.concurrency == index]
+        flow = CartFlow(api, offers, clients, args.batch_carts, random.Random(args.seed + index))
+        for iteration in range(iterations // args.concurrency):
+            flow.run(iteration)
+        flow.settle()
+
+    wall = run_parallel(args.concurrency, worker)
+    if recorder is not None:
+        for name in recorder.samples:
+            if not name.startswith("GET "):
+                recorder.wall_times[name] = wall
+
+
+def load_offers(port: int, clients: int) -> dict[int, list[int]]:
+
+    """Valid offer ids per client (clients with fewer than two are skipped)."""
+
+    api = ApiClient(port, recorder=None)
+    offers = {}
+    for client_id in range(1, clients + 1):
+        page = api.call("", "GET", f"/catalog/client/offers/{client_id}?limit=500")
+        offer_ids = [offer["id"] for offer in (page or {}).get("items", [])]
+        if len(offer_ids) >= 2:
+            offers[client_id] = offer_ids
+
+    return offers
+
+
+def seed_database(env: dict[str, str], args: argparse.Namespace) -> None:
+
+    subprocess.run(
+        [
+            sys.executable, "-m", "app.db.seed_database",
+            "--clients", str(args.clients),
+            "--products", str(args.products),
+            "--offer-density", str(args.offer_density),
+            "--carts", str(args.history_carts),
+            "--seed", str(args.seed),
+        ],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def start_server(env: dict[str, str], port: int, workers: int) -> subprocess.Popen:
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def free_port() -> int:
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def git_revision() -> str | None:
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+
+    """Prints the per-endpoint deltas and returns the regressed endpoints."""
+
+    regressions = []
+    print(f"\n{'endpoint':<48} {'p95 Δ':>9} {'p99 Δ':>9} {'rps Δ':>9}")
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<48} {'(new)':>9}")
+            continue
+
+        deltas = {
+            metric: (stats[metric] - base[metric]) / base[metric] if base.get(metric) else 0.0
+            for metric in ("p95_ms", "p99_ms", "throughput_rps")
+            if stats.get(metric) is not None and base.get(metric) is not None
+        }
+        regressed = (
+            deltas.get("p95_ms", 0) > threshold
+            or deltas.get("p99_ms", 0) > threshold
+            or deltas.get("throughput_rps", 0) < -threshold
+        )
+        if regressed:
+            regressions.append(name)
+
+        print(
+            f"{name:<48} {deltas.get('p95_ms', 0):>+9.1%} {deltas.get('p99_ms', 0):>+9.1%} "
+            f"{deltas.get('throughput_rps', 0):>+9.1%}{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+
+def print_report(summary: dict[str, dict]) -> None:
+
+    header = f"{'endpoint':<48} {'reqs':>6} {'err':>4} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in summary.items():
+        print(
+            f"{name:<48} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps'] or 0:>9.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--iterations", type=int, default=400, help="requests per catalog endpoint and cart flows")
+    parser.add_argument("--warmup", type=int, default=40, help="unrecorded iterations before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--async-db", action="store_true", help="run the app with DATA_BASE_ASYNC=true")
+    parser.add_argument("--database", help="existing SQLite file to use (skips seeding)")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--offer-density", type=float, default=0.3)
+    parser.add_argument("--history-carts", type=int, default=5000)
+    parser.add_argument("--batch-carts", type=int, default=10, help="carts settled per /payments/batch call")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    workdir = None
+    if args.database:
+        database = Path(args.database).resolve()
+    else:
+        workdir = tempfile.TemporaryDirectory(prefix="clubbi-bench-")
+        database = Path(workdir.name) / "bench.db"
+
+    env = {
+        **os.environ,
+        "DATA_BASE_URL": f"sqlite:///{database}",
+        "DATA_BASE_ASYNC": "true" if args.async_db else "false",
+        "DB_PROFILE": "bench",
+    }
+
+    try:
+        if not args.database:
+            print(f"🌱 Gerando base em {database}...")
+            seed_database(env, args)
+
+        port = free_port()
+        server = start_server(env, port, args.workers)
+        try:
+            offers = load_offers(port, args.clients)
+            if len(offers) < args.concurrency:
+                raise SystemExit("Not enough clients with offers for the requested concurrency")
+
+            client_ids = sorted(offers)
+            print(f"🔥 Aquecendo ({args.warmup} iterações)...")
+            warmup = argparse.Namespace(**{**vars(args), "iterations": args.warmup})
+            run_catalog(port, None, client_ids, warmup)
+            run_flows(port, None, offers, args.warmup, args)
+
+            print(f"⏱️  Medindo ({args.iterations} iterações, concorrência {args.concurrency})...\n")
+            recorder = Recorder()
+            run_catalog(port, recorder, client_ids, args)
+            run_flows(port, recorder, offers, args.iterations, args)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+    summary = recorder.summary()
+    print_report(summary)
+
+    result = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        },
+        "endpoints": summary,
+    }
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Resultados salvos em {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(summary, baseline["endpoints"], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} endpoint(s) acima do limite de {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma regressão acima de {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
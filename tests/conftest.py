@@ -0,0 +1,58 @@
+"""
+Shared fixtures.
+
+app.config reads the environment once, at import time, so the test database
+and switches are set here, before anything from `app` is imported. The
+session runs against a fresh SQLite file seeded once with the default
+SeedConfig; tests create their own carts, so they do not depend on order.
+"""
+
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="clubbi-tests-")
+
+os.environ["DATA_BASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ["DATA_BASE_ASYNC"] = "false"
+os.environ["DATA_BASE_READ_URL"] = ""
+os.environ["DB_LAZY_LOAD_GUARD"] = "true"
+os.environ["SWEEPER_ENABLED"] = "false"
+os.environ["ACCESS_LOG"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+
+    from app.main import app
+    from app.db.seed_database import seed_data
+
+    with TestClient(app) as test_client:
+        seed_data()
+        yield test_client
+
+
+@pytest.fixture
+def db_session(client):
+
+    from app.db.connection import get_sessionmaker
+
+    with get_sessionmaker()() as session:
+        yield session
+
+
+@pytest.fixture
+def open_cart(client):
+
+    """Creates an OPEN cart for a customer; returns its id and the customer's valid offers."""
+
+    # A customer holds one OPEN/CHECKOUT cart at a time: each test uses its own customer
+    def create(client_id: int) -> tuple[int, list[dict]]:
+        cart = client.post(f"/api/v1/cart/create-cart/{client_id}")
+        assert cart.status_code == 201
+        offers = client.get(f"/api/v1/catalog/client/offers/{client_id}").json()["items"]
+        return cart.json()["id"], offers
+
+    return create
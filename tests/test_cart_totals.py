@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    select,
+    func,
+)
+
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+
+
+def _stored_totals(db_session, cart_id: int) -> tuple[Decimal, int]:
+
+    cart = db_session.get(Cart, cart_id)
+    return cart.subtotal, cart.item_count
+
+
+def _computed_totals(db_session, cart_id: int) -> tuple[Decimal, int]:
+
+    subtotal, item_count = db_session.execute(
+        select(
+            func.coalesce(func.sum(CartItem.quantity * CartItem.unit_price_snapshot), 0),
+            func.coalesce(func.sum(CartItem.quantity), 0),
+        ).where(CartItem.cart_id == cart_id)
+    ).one()
+    return Decimal(subtotal).quantize(Decimal("0.01")), item_count
+
+
+def test_adding_the_same_offer_twice_increments_one_item(client, open_cart, db_session):
+
+    cart_id, offers = open_cart(client_id=1)
+    offer = offers[0]
+
+    client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": offer["id"], "quantity": 2})
+    response = client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": offer["id"], "quantity": 3})
+
+    assert response.status_code == 200
+    cart = response.json()
+    assert [(item["offer_id"], item["quantity"]) for item in cart["items"]] == [(offer["id"], 5)]
+    assert Decimal(cart["subtotal"]) == 5 * Decimal(offer["unit_price"])
+    assert cart["item_count"] == 5
+    assert _stored_totals(db_session, cart_id) == _computed_totals(db_session, cart_id)
+
+
+def test_bulk_add_merges_repeated_offers_and_keeps_totals(client, open_cart, db_session):
+
+    cart_id, offers = open_cart(client_id=2)
+    first, second = offers[0], offers[1]
+    client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": first["id"], "quantity": 1})
+
+    response = client.post(
+        f"/api/v1/cart/{cart_id}/items/bulk",
+        json={"items": [
+            {"offer_id": first["id"], "quantity": 2},
+            {"offer_id": second["id"], "quantity": 4},
+            {"offer_id": first["id"], "quantity": 1},
+            {"offer_id": 999999, "quantity": 1},
+        ]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["added"] for result in body["results"]] == [True, True, True, False]
+    assert body["results"][3]["error"] == "OfferNotFoundError"
+
+    quantities = {item["offer_id"]: item["quantity"] for item in body["cart"]["items"]}
+    assert quantities == {first["id"]: 4, second["id"]: 4}
+    assert Decimal(body["cart"]["subtotal"]) == 4 * Decimal(first["unit_price"]) + 4 * Decimal(second["unit_price"])
+    assert body["cart"]["item_count"] == 8
+    assert _stored_totals(db_session, cart_id) == _computed_totals(db_session, cart_id)
+
+
+def test_removing_an_item_subtracts_it_from_the_totals(client, open_cart, db_session):
+
+    cart_id, offers = open_cart(client_id=3)
+    client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": offers[0]["id"], "quantity": 2})
+    cart = client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": offers[1]["id"], "quantity": 1}).json()
+    removed = next(item for item in cart["items"] if item["offer_id"] == offers[0]["id"])
+
+    response = client.delete(f"/api/v1/cart/{cart_id}/items/{removed['id']}")
+
+    assert response.status_code == 200
+    assert Decimal(response.json()["subtotal"]) == Decimal(offers[1]["unit_price"])
+    assert response.json()["item_count"] == 1
+    assert _stored_totals(db_session, cart_id) == _computed_totals(db_session, cart_id)
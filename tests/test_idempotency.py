@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+
+from app.db.connection import get_sessionmaker
+from app.exceptions import IdempotencyRequestInProgressError
+from app.services.idempotency_service.IdempotencyService import IdempotencyService
+
+
+def _cart_with_items(client, open_cart, client_id: int) -> int:
+
+    cart_id, offers = open_cart(client_id=client_id)
+    client.post(f"/api/v1/cart/{cart_id}/items", json={"offer_id": offers[0]["id"], "quantity": 1})
+    return cart_id
+
+
+def test_retry_with_the_same_key_replays_the_stored_response(client, open_cart):
+
+    cart_id = _cart_with_items(client, open_cart, client_id=4)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post(f"/api/v1/checkout/{cart_id}", headers=headers)
+    retry = client.post(f"/api/v1/checkout/{cart_id}", headers=headers)
+
+    assert first.status_code == 200
+    assert first.json()["status"] == "checkout"
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.content == first.content
+
+
+def test_payment_retry_does_not_charge_twice(client, open_cart):
+
+    cart_id = _cart_with_items(client, open_cart, client_id=5)
+    client.post(f"/api/v1/checkout/{cart_id}")
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post(f"/api/v1/checkout/payment/{cart_id}", headers=headers)
+    retry = client.post(f"/api/v1/checkout/payment/{cart_id}", headers=headers)
+    without_key = client.post(f"/api/v1/checkout/payment/{cart_id}")
+
+    assert first.status_code == 200
+    assert retry.json()["payment"]["id"] == first.json()["payment"]["id"]
+    # Without the key the request runs again and the cart is no longer in CHECKOUT
+    assert without_key.status_code != 200
+
+
+def test_key_reused_for_another_request_is_rejected_with_422(client, open_cart):
+
+    cart_id = _cart_with_items(client, open_cart, client_id=6)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    client.post(f"/api/v1/checkout/{cart_id}", headers=headers)
+
+    response = client.post(f"/api/v1/checkout/payment/{cart_id}", headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["error"] == "IdempotencyKeyReusedError"
+
+
+def test_key_stored_concurrently_is_answered_with_409(client):
+
+    # Both requests passed lookup() before either committed; the second to save loses
+    key = str(uuid.uuid4())
+    with get_sessionmaker()() as first, get_sessionmaker()() as second:
+        IdempotencyService(first).save(key=key, scope="POST /checkout/1", status_code=200, body=b"{}")
+        first.commit()
+
+        with pytest.raises(IdempotencyRequestInProgressError) as raised:
+            IdempotencyService(second).save(key=key, scope="POST /checkout/1", status_code=200, body=b"{}")
+        assert raised.value.status_code == 409
+
+        # The savepoint was rolled back, the request's transaction is still usable
+        second.rollback()
@@ -0,0 +1,94 @@
+"""
+Upgrade of a database created before the cart totals and the composite offers index.
+
+The baseline shape is rebuilt from the current models by dropping what later
+versions added (carts.subtotal, carts.item_count, ix_offers_client_id_valid_until),
+then filled with a cart whose totals must be backfilled.
+"""
+
+from datetime import (
+    date,
+    timedelta,
+)
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import (
+    create_engine,
+    inspect,
+    insert,
+    select,
+)
+
+import app.main  # noqa: F401  registers every model on Base.metadata
+from app.db.base import Base
+from app.db.schema import ensure_schema
+from app.models.cart import Cart
+from app.models.cart_item import CartItem
+from app.models.client import Client
+from app.models.offer import Offer
+from app.models.product import Product
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_offers_client_id_valid_until")
+        conn.exec_driver_sql("ALTER TABLE carts DROP COLUMN subtotal")
+        conn.exec_driver_sql("ALTER TABLE carts DROP COLUMN item_count")
+
+        conn.execute(insert(Client.__table__).values(id=1, name="Mercado", cnpj="00000000000100", address="Rua A"))
+        conn.execute(insert(Product.__table__), [
+            {"id": product_id, "name": f"Produto {product_id}", "ean": f"789000000000{product_id}", "items_per_box": 12}
+            for product_id in (1, 2)
+        ])
+        conn.execute(insert(Offer.__table__), [
+            {"id": offer_id, "client_id": 1, "product_id": offer_id, "unit_price": Decimal("2.50") * offer_id,
+             "valid_until": date.today() + timedelta(days=30)}
+            for offer_id in (1, 2)
+        ])
+        # The ORM table now has the totals columns, so the baseline rows are written with plain SQL
+        conn.exec_driver_sql(
+            "INSERT INTO carts (id, client_id, status, created_at) "
+            "VALUES (1, 1, 'OPEN', CURRENT_TIMESTAMP), (2, 1, 'PAID', CURRENT_TIMESTAMP)"
+        )
+        conn.execute(insert(CartItem.__table__), [
+            {"cart_id": 1, "offer_id": 1, "quantity": 3, "unit_price_snapshot": Decimal("2.50")},
+            {"cart_id": 1, "offer_id": 2, "quantity": 1, "unit_price_snapshot": Decimal("5.00")},
+        ])
+
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_adds_and_backfills_cart_totals(baseline_engine):
+
+    assert ensure_schema(baseline_engine) is True
+
+    columns = {column["name"] for column in inspect(baseline_engine).get_columns("carts")}
+    assert {"subtotal", "item_count"} <= columns
+
+    with baseline_engine.connect() as conn:
+        totals = {
+            cart_id: (subtotal, item_count)
+            for cart_id, subtotal, item_count in conn.execute(select(Cart.id, Cart.subtotal, Cart.item_count))
+        }
+    assert totals == {1: (Decimal("12.50"), 4), 2: (Decimal("0.00"), 0)}
+
+
+def test_upgrade_creates_the_offers_composite_index(baseline_engine):
+
+    ensure_schema(baseline_engine)
+
+    indexes = {index["name"] for index in inspect(baseline_engine).get_indexes("offers")}
+    assert "ix_offers_client_id_valid_until" in indexes
+
+
+def test_upgrade_runs_once(baseline_engine):
+
+    assert ensure_schema(baseline_engine) is True
+    assert ensure_schema(baseline_engine) is False